@@ -0,0 +1,203 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import networkx as nx
+import numpy as np
+
+# -----------------------
+# Motter-Lai style overload cascades
+# -----------------------
+
+class CascadeModel:
+    """
+    Relay load from a fixed set of routed flows (source, target pairs), with Motter-Lai
+    capacities C = (1 + alpha) * max(L0, 1), where L0 is the node's initial relay load (the
+    floor lets idle nodes absorb one flow). Loads are kept up to date incrementally: an inverted
+    index from node to the flows crossing it means a failure only reroutes those flows, each by
+    one bidirectional BFS, instead of recomputing betweenness per cascade wave.
+    """
+
+    def __init__(self, graph: nx.Graph, num_flows: int, alpha: float, recover_steps: int, rng: np.random.Generator):
+        self.graph = graph
+        self.alpha = alpha
+        self.recover_steps = recover_steps
+        nodes = list(graph.nodes())
+        self.flows: List[Tuple[int, int]] = []
+        if len(nodes) >= 2:
+            for _ in range(num_flows):
+                i, j = rng.choice(len(nodes), size=2, replace=False)
+                self.flows.append((nodes[i], nodes[j]))
+        self.paths: List[Optional[List[int]]] = [None] * len(self.flows)
+        self.load: Dict[int, int] = defaultdict(int)
+        self.flows_at: Dict[int, Set[int]] = defaultdict(set)  # node -> flows relayed through it
+        self.dropped: Set[int] = set()                          # flows without a route
+        self.flows_ending_at: Dict[int, Set[int]] = defaultdict(set)
+        for f, (s, t) in enumerate(self.flows):
+            self.flows_ending_at[s].add(f)
+            self.flows_ending_at[t].add(f)
+
+        # Components exhausted by failed searches during one propagate() call: within a call
+        # nodes only go down, so a flow whose endpoints fall on different sides stays unroutable
+        self._component_of: Dict[int, int] = {}
+        self._components: List[Set[int]] = []
+
+        for f in range(len(self.flows)):
+            self._route(f)
+        self._forget_components()
+        self.capacity: Dict[int, float] = {n: (1.0 + alpha) * max(self.load[n], 1) for n in nodes}
+
+    # --- operational state (same attributes as SinkTreeRouter) ---
+
+    def _online(self, n: int) -> bool:
+        return self.graph.nodes[n].get('online', True)
+
+    def _usable_neighbors(self, n: int):
+        for w, ed in self.graph[n].items():
+            if ed.get('up', True) and self._online(w):
+                yield w
+
+    def shortest_path(self, s: int, t: int) -> Optional[List[int]]:
+        """Bidirectional BFS over online nodes and up links; expands the smaller frontier first."""
+        if not (self._online(s) and self._online(t)):
+            return None
+        if s == t:
+            return [s]
+        pred: Dict[int, Optional[int]] = {s: None}
+        succ: Dict[int, Optional[int]] = {t: None}
+        forward, backward = [s], [t]
+        meet = None
+        while forward and backward and meet is None:
+            if len(forward) <= len(backward):
+                forward, meet = self._expand(forward, pred, succ)
+            else:
+                backward, meet = self._expand(backward, succ, pred)
+        if meet is None:
+            exhausted = pred if not forward else succ
+            self._remember_component(exhausted.keys())
+            return None
+        path = []
+        n: Optional[int] = meet
+        while n is not None:
+            path.append(n)
+            n = pred[n]
+        path.reverse()
+        n = succ[meet]
+        while n is not None:
+            path.append(n)
+            n = succ[n]
+        return path
+
+    def _expand(self, frontier: List[int], seen: Dict[int, Optional[int]], other: Dict[int, Optional[int]]):
+        nxt = []
+        for u in frontier:
+            for w in self._usable_neighbors(u):
+                if w not in seen:
+                    seen[w] = u
+                    if w in other:
+                        return nxt, w
+                    nxt.append(w)
+        return nxt, None
+
+    def _remember_component(self, nodes: Iterable[int]):
+        cid = len(self._components)
+        component = set(nodes)
+        self._components.append(component)
+        for n in component:
+            self._component_of[n] = cid
+
+    def _forget_components(self):
+        self._component_of.clear()
+        self._components.clear()
+
+    def _known_unreachable(self, s: int, t: int) -> bool:
+        for a, b in ((s, t), (t, s)):
+            cid = self._component_of.get(a)
+            if cid is not None and b not in self._components[cid]:
+                return True
+        return False
+
+    # --- load bookkeeping ---
+
+    def _route(self, f: int) -> List[int]:
+        """Routes flow f and adds its relay load; returns the relays whose load grew."""
+        s, t = self.flows[f]
+        path = None if self._known_unreachable(s, t) else self.shortest_path(s, t)
+        self.paths[f] = path
+        if path is None:
+            self.dropped.add(f)
+            return []
+        self.dropped.discard(f)
+        relays = path[1:-1]
+        for n in relays:
+            self.load[n] += 1
+            self.flows_at[n].add(f)
+        return relays
+
+    def _unroute(self, f: int):
+        path = self.paths[f]
+        if path is None:
+            return
+        for n in path[1:-1]:
+            self.load[n] -= 1
+            self.flows_at[n].discard(f)
+        self.paths[f] = None
+
+    def _flows_over_link(self, u: int, v: int) -> Set[int]:
+        # A path crossing (u, v) has u or v as a relay, unless it is the single hop between them
+        candidates = self.flows_at.get(u, set()) | self.flows_at.get(v, set())
+        candidates |= self.flows_ending_at.get(u, set()) & self.flows_ending_at.get(v, set())
+        hit = set()
+        for f in candidates:
+            path = self.paths[f]
+            if path is not None and any((a == u and b == v) or (a == v and b == u) for a, b in zip(path, path[1:])):
+                hit.add(f)
+        return hit
+
+    def _flows_touching(self, nodes: Iterable[int]) -> Set[int]:
+        """Routed flows relayed by, starting at or ending at any of the nodes."""
+        hit: Set[int] = set()
+        for n in nodes:
+            hit |= self.flows_at.get(n, set())
+            hit |= {f for f in self.flows_ending_at.get(n, ()) if self.paths[f] is not None}
+        return hit
+
+    # --- propagation ---
+
+    def propagate(
+            self,
+            nodes_down: Iterable[int],
+            links_down: Iterable[Tuple[int, int]],
+            restored: bool = False,
+    ) -> List[List[int]]:
+        """
+        Reroutes the flows hit by this step's node/link losses (and, if anything came back,
+        the dropped flows), then fails every node pushed over capacity and repeats with the
+        flows they carried until no node is overloaded. Overloaded nodes go offline with the
+        usual recovery timer. Returns the failed nodes per cascade wave.
+        """
+        affected = self._flows_touching(nodes_down)
+        for u, v in links_down:
+            affected |= self._flows_over_link(u, v)
+        if restored:
+            affected |= self.dropped
+
+        waves: List[List[int]] = []
+        while affected:
+            grown: Set[int] = set()
+            for f in sorted(affected):
+                self._unroute(f)
+            for f in sorted(affected):
+                grown.update(self._route(f))
+            overloaded = sorted(n for n in grown if self._online(n) and self.load[n] > self.capacity[n])
+            if not overloaded:
+                break
+            for n in overloaded:
+                self.graph.nodes[n]['online'] = False
+                self.graph.nodes[n]['recover_timer'] = self.recover_steps
+            waves.append(overloaded)
+            affected = self._flows_touching(overloaded)
+        self._forget_components()
+        return waves
+
+    def routed_fraction(self) -> float:
+        return 1.0 - len(self.dropped) / len(self.flows) if self.flows else 0.0
@@ -1,11 +1,25 @@
-import random
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple
 
 import networkx as nx
 import numpy as np
 import pandas as pd
 
+from analysis.cascades import CascadeModel
+from analysis.event_log import (
+    LINK_ADDED,
+    LINK_DOWN,
+    LINK_REMOVED,
+    LINK_UP,
+    NODE_DEATH,
+    NODE_FAIL,
+    NODE_RECOVER,
+    EventLogWriter,
+)
+from analysis.routing import SinkTreeRouter, sensor_nodes, sink_nodes
+from analysis.sparse_kernels import MaskedCSR, largest_component_size, shortest_paths
+from analysis.spatial_links import SpatialLinkModel, SpatialLinkParams
+
 # -----------------------
 # Data structures
 # -----------------------
@@ -24,6 +38,14 @@ class DynamicParams:
     link_down_steps: int = 10
     ttr_epsilon: float = 0.02        # recovery threshold as fraction of baseline LCC
     compute_algebraic_connectivity: bool = False
+    traffic_model: str = 'uniform'   # 'uniform' (random node pairs) or 'sink' (sensors -> sinks)
+    traffic_target: str = 'sink'     # for 'sink' traffic: 'sink' or 'gateway' (nearest sink/gateway)
+    link_model: str = 'flat'         # 'flat' (link_flip_prob per edge) or 'spatial' (distance/interference, needs 'pos')
+    spatial: SpatialLinkParams = field(default_factory=SpatialLinkParams)
+    kernel: str = 'networkx'         # 'networkx' or 'sparse' (NumPy/SciPy BFS and components on a masked CSR)
+    cascade_enabled: bool = False    # Motter-Lai overload cascades driven by routed relay load
+    cascade_alpha: float = 0.2       # capacity tolerance: C = (1 + alpha) * initial load
+    cascade_num_flows: int = 200     # routed (source, target) flows that define the relay load
 
 @dataclass
 class TtrEvent:
@@ -65,20 +87,25 @@ def lcc_fraction(sub: nx.Graph, total_nodes: int) -> float:
     largest = max((len(c) for c in comps), default=0)
     return largest / float(total_nodes)
 
+def sparse_lcc_fraction(csr: MaskedCSR, total_nodes: int) -> float:
+    if total_nodes == 0:
+        return 0.0
+    return largest_component_size(csr) / float(total_nodes)
+
 # -----------------------
 # Packet delivery and energy model
 # -----------------------
 
-def pick_two_distinct(nodes: List[int]) -> Optional[Tuple[int, int]]:
+def pick_two_distinct(nodes: List[int], rng: np.random.Generator) -> Optional[Tuple[int, int]]:
     if len(nodes) < 2:
         return None
-    a, b = random.sample(nodes, 2)
-    return a, b
+    i, j = rng.choice(len(nodes), size=2, replace=False)
+    return nodes[i], nodes[j]
 
-def attempt_packet(graph: nx.Graph) -> Tuple[bool, Optional[List[int]]]:
+def attempt_packet(graph: nx.Graph, rng: np.random.Generator) -> Tuple[bool, Optional[List[int]]]:
     sub = build_operational_graph(graph)
     nodes = list(sub.nodes())
-    pair = pick_two_distinct(nodes)
+    pair = pick_two_distinct(nodes, rng)
     if pair is None:
         return False, None
     s, t = pair
@@ -88,6 +115,29 @@ def attempt_packet(graph: nx.Graph) -> Tuple[bool, Optional[List[int]]]:
     except (nx.NetworkXNoPath, nx.NodeNotFound):
         return False, None
 
+def attempt_packets_sparse(csr: MaskedCSR, count: int, rng: np.random.Generator) -> List[Tuple[bool, Optional[List[int]]]]:
+    """
+    Batched counterpart of attempt_packet: draws the node pairs exactly as `count` calls of
+    attempt_packet would, then routes all of them with one batched frontier BFS.
+    """
+    nodes = csr.alive_nodes()
+    pairs = [pick_two_distinct(nodes, rng) for _ in range(count)]
+    paths = iter(shortest_paths(csr, [p for p in pairs if p is not None]))
+    results: List[Tuple[bool, Optional[List[int]]]] = []
+    for pair in pairs:
+        path = next(paths) if pair is not None else None
+        results.append((path is not None, path))
+    return results
+
+def attempt_sink_packet(router: SinkTreeRouter, sources: List[int], rng: np.random.Generator) -> Tuple[bool, Optional[List[int]]]:
+    """Sends a packet from a random online sensor to its nearest sink along the routing tree."""
+    if not sources:
+        return False, None
+    path = router.path(sources[rng.integers(len(sources))])
+    if path is None:
+        return False, None
+    return True, path
+
 def apply_energy_drain(graph: nx.Graph, path: Optional[List[int]], params: DynamicParams) -> List[int]:
     died_now: List[int] = []
     # Base drain for all online nodes
@@ -133,11 +183,11 @@ def apply_energy_drain(graph: nx.Graph, path: Optional[List[int]], params: Dynam
 # Failure and recovery dynamics
 # -----------------------
 
-def schedule_random_node_failure(graph: nx.Graph, recover_steps: int) -> Optional[int]:
+def schedule_random_node_failure(graph: nx.Graph, recover_steps: int, rng: np.random.Generator) -> Optional[int]:
     candidates = [n for n in operational_nodes(graph) if not graph.nodes[n].get('dead', False)]
     if not candidates:
         return None
-    victim = random.choice(candidates)
+    victim = candidates[rng.integers(len(candidates))]
     graph.nodes[victim]['online'] = False
     # Only schedule recovery if not dead due to energy
     if not graph.nodes[victim].get('dead', False):
@@ -145,7 +195,8 @@ def schedule_random_node_failure(graph: nx.Graph, recover_steps: int) -> Optiona
     return victim
 
 
-def step_recoveries(graph: nx.Graph):
+def step_recoveries(graph: nx.Graph) -> List[int]:
+    recovered: List[int] = []
     for n, d in graph.nodes(data=True):
         if not d.get('online', True) and not d.get('dead', False):
             t = d.get('recover_timer', 0)
@@ -153,14 +204,28 @@ def step_recoveries(graph: nx.Graph):
                 graph.nodes[n]['recover_timer'] = t - 1
                 if t - 1 == 0:
                     graph.nodes[n]['online'] = True
-
-
-def step_link_instability(graph: nx.Graph, flip_prob: float, down_steps: int):
+                    recovered.append(n)
+    return recovered
+
+
+def step_link_instability(
+        graph: nx.Graph,
+        flip_prob: float,
+        down_steps: int,
+        rng: np.random.Generator,
+) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]]]:
+    """Returns the links that went down and the links that came back up during this step."""
+    went_down: List[Tuple[int, int]] = []
+    came_up: List[Tuple[int, int]] = []
     if flip_prob <= 0:
-        return
-    for u, v, ed in graph.edges(data=True):
-        if random.random() < flip_prob:
+        return went_down, came_up
+    # One draw per edge, taken as a single array from the stream
+    flips = rng.random(graph.number_of_edges()) < flip_prob
+    for (u, v, ed), flip in zip(graph.edges(data=True), flips.tolist()):
+        if flip:
             # toggle down
+            if ed.get('up', True):
+                went_down.append((u, v))
             ed['up'] = False
             ed['down_timer'] = down_steps
         elif not ed.get('up', True):
@@ -170,6 +235,8 @@ def step_link_instability(graph: nx.Graph, flip_prob: float, down_steps: int):
                 ed['down_timer'] = t - 1
                 if t - 1 == 0:
                     ed['up'] = True
+                    came_up.append((u, v))
+    return went_down, came_up
 
 # -----------------------
 # Initialization
@@ -189,13 +256,25 @@ def initialize_state(graph: nx.Graph, params: DynamicParams):
 # Main simulation
 # -----------------------
 
-def simulate_dynamic(graph: nx.Graph, params: Optional[DynamicParams] = None, seed: Optional[int] = None) -> Tuple[pd.DataFrame, Dict[str, float]]:
+def simulate_dynamic(
+        graph: nx.Graph,
+        params: Optional[DynamicParams] = None,
+        seed: Optional[int] = None,
+        event_log: Optional[EventLogWriter] = None,
+        rng: Optional[np.random.Generator] = None,
+) -> Tuple[pd.DataFrame, Dict[str, float]]:
+    """
+    Runs the dynamic simulation on graph (mutating its node/edge state attributes).
+    All random choices draw from rng; without one, a stream is created from seed. The global
+    random/np.random state is never touched, so concurrent runs cannot interfere.
+    If event_log is given, every node fail/recover/death, link down/up and (with mobility)
+    link added/removed is recorded to it; the caller owns (and closes) the writer.
+    """
     if params is None:
         params = DynamicParams()
 
-    if seed is not None:
-        random.seed(seed)
-        np.random.seed(seed)
+    if rng is None:
+        rng = np.random.default_rng(seed)
 
     initialize_state(graph, params)
 
@@ -212,27 +291,120 @@ def simulate_dynamic(graph: nx.Graph, params: Optional[DynamicParams] = None, se
     sub0 = build_operational_graph(graph)
     _baseline_lcc = lcc_fraction(sub0, total_nodes)
 
+    router: Optional[SinkTreeRouter] = None
+    sensors: List[int] = []
+    if params.traffic_model == 'sink':
+        sinks = sink_nodes(graph, params.traffic_target)
+        router = SinkTreeRouter(graph, sinks)
+        sensors = sensor_nodes(graph, sinks)
+    elif params.traffic_model != 'uniform':
+        raise ValueError(f"Unknown traffic model: {params.traffic_model}")
+
+    # Graphs without node positions (everything but RGG) keep the flat link model
+    spatial: Optional[SpatialLinkModel] = None
+    if params.link_model == 'spatial':
+        if total_nodes and all('pos' in d for _, d in graph.nodes(data=True)):
+            spatial = SpatialLinkModel(graph, params.link_flip_prob, params.link_down_steps, params.spatial, rng)
+    elif params.link_model != 'flat':
+        raise ValueError(f"Unknown link model: {params.link_model}")
+
+    # The sparse kernel mirrors node/link state in alive masks, updated alongside the router
+    csr: Optional[MaskedCSR] = None
+    if params.kernel == 'sparse':
+        csr = MaskedCSR(graph)
+    elif params.kernel != 'networkx':
+        raise ValueError(f"Unknown kernel: {params.kernel}")
+
+    cascade: Optional[CascadeModel] = None
+    if params.cascade_enabled:
+        cascade = CascadeModel(graph, params.cascade_num_flows, params.cascade_alpha, params.node_recovery_steps, rng)
+    cascade_sizes: List[int] = []
+
+    def current_lcc() -> float:
+        if csr is not None:
+            return sparse_lcc_fraction(csr, total_nodes)
+        return lcc_fraction(build_operational_graph(graph), total_nodes)
+
     records: List[Dict] = []
 
     for t in range(params.steps):
+        if event_log is not None:
+            event_log.begin_step(t)
+        failed_now: List[int] = []
+        links_added: List[Tuple[int, int]] = []
+        links_removed: List[Tuple[int, int]] = []
+
         # Failure event schedule
         if params.node_failure_period and t > 0 and t % params.node_failure_period == 0:
             # capture baseline before failure
-            sub_pre = build_operational_graph(graph)
-            baseline = lcc_fraction(sub_pre, total_nodes)
-            scheduled = schedule_random_node_failure(graph, params.node_recovery_steps)
+            baseline = current_lcc()
+            scheduled = schedule_random_node_failure(graph, params.node_recovery_steps, rng)
             if scheduled is not None:
+                failed_now.append(scheduled)
                 ttr_events.append(TtrEvent(start_step=t, baseline_lcc=baseline))
+                if router is not None:
+                    router.node_down(scheduled)
+                if csr is not None:
+                    csr.set_node(scheduled, False)
+                if event_log is not None:
+                    event_log.record(NODE_FAIL, scheduled)
+
+        # Mobility: links are created/broken only around the nodes that moved
+        if spatial is not None:
+            links_added, links_removed = spatial.move_nodes()
+            if router is not None:
+                for u, v in links_removed:
+                    router.edge_down(u, v)
+                for u, v in links_added:
+                    router.edge_up(u, v)
+            if csr is not None and (links_added or links_removed):
+                csr.rebuild(graph)  # topology changed: masks alone cannot express new links
+            if event_log is not None:
+                for u, v in links_removed:
+                    event_log.record(LINK_REMOVED, u, v)
+                for u, v in links_added:
+                    event_log.record(LINK_ADDED, u, v)
 
         # Link instability and recoveries
-        step_link_instability(graph, params.link_flip_prob, params.link_down_steps)
-        step_recoveries(graph)
+        if spatial is not None:
+            links_down, links_up = spatial.step()
+        else:
+            links_down, links_up = step_link_instability(graph, params.link_flip_prob, params.link_down_steps, rng)
+        recovered = step_recoveries(graph)
+        if router is not None:
+            # Repair the routing tree: removals first, then improvements
+            for u, v in links_down:
+                router.edge_down(u, v)
+            for n in recovered:
+                router.node_up(n)
+            for u, v in links_up:
+                router.edge_up(u, v)
+            online_sources = [n for n in sensors if graph.nodes[n].get('online', True)]
+        if csr is not None:
+            for u, v in links_down:
+                csr.set_edge(u, v, False)
+            for n in recovered:
+                csr.set_node(n, True)
+            for u, v in links_up:
+                csr.set_edge(u, v, True)
+        if event_log is not None:
+            for u, v in links_down:
+                event_log.record(LINK_DOWN, u, v)
+            for n in recovered:
+                event_log.record(NODE_RECOVER, n)
+            for u, v in links_up:
+                event_log.record(LINK_UP, u, v)
 
         # Packet attempts
         delivered_this_step = 0
         path_used: Optional[List[int]] = None
-        for _ in range(params.packet_rate):
-            success, path = attempt_packet(graph)
+        if router is not None:
+            attempts = (attempt_sink_packet(router, online_sources, rng) for _ in range(params.packet_rate))
+        elif csr is not None:
+            attempts = iter(attempt_packets_sparse(csr, params.packet_rate, rng))
+        else:
+            attempts = (attempt_packet(graph, rng) for _ in range(params.packet_rate))
+        for success, path in attempts:
             total_packets += 1
             if success:
                 successful_packets += 1
@@ -243,11 +415,45 @@ def simulate_dynamic(graph: nx.Graph, params: Optional[DynamicParams] = None, se
         died_now = apply_energy_drain(graph, path_used, params)
         if died_now and first_death_time is None:
             first_death_time = t
+        if router is not None:
+            for n in died_now:
+                router.node_down(n)
+        if csr is not None:
+            for n in died_now:
+                csr.set_node(n, False)
+        if event_log is not None:
+            for n in died_now:
+                event_log.record(NODE_DEATH, n)
+
+        # Overload cascade: relay load of lost nodes/links moves to the rerouted paths
+        cascade_failed: List[int] = []
+        if cascade is not None:
+            waves = cascade.propagate(
+                failed_now + died_now,
+                links_down + links_removed,
+                restored=bool(recovered or links_up or links_added),
+            )
+            cascade_failed = [n for wave in waves for n in wave]
+            if cascade_failed:
+                cascade_sizes.append(len(cascade_failed))
+            if router is not None:
+                for n in cascade_failed:
+                    router.node_down(n)
+            if csr is not None:
+                for n in cascade_failed:
+                    csr.set_node(n, False)
+            if event_log is not None:
+                for n in cascade_failed:
+                    event_log.record(NODE_FAIL, n)
 
         # Metrics at this step
-        sub = build_operational_graph(graph)
-        lcc = lcc_fraction(sub, total_nodes)
-        online_frac = len(operational_nodes(graph)) / float(total_nodes) if total_nodes else 0.0
+        if csr is not None:
+            lcc = sparse_lcc_fraction(csr, total_nodes)
+            online_frac = int(csr.node_alive.sum()) / float(total_nodes) if total_nodes else 0.0
+        else:
+            sub = build_operational_graph(graph)
+            lcc = lcc_fraction(sub, total_nodes)
+            online_frac = len(operational_nodes(graph)) / float(total_nodes) if total_nodes else 0.0
 
         if lcc_collapse_time is None and lcc < 0.5:
             lcc_collapse_time = t
@@ -266,8 +472,13 @@ def simulate_dynamic(graph: nx.Graph, params: Optional[DynamicParams] = None, se
             'ddr_cumulative': (successful_packets / total_packets) if total_packets else 0.0,
             'delivered_this_step': delivered_this_step,
         }
+        if cascade is not None:
+            rec['cascade_failures'] = len(cascade_failed)
+            rec['routed_flows_fraction'] = cascade.routed_fraction()
 
         if params.compute_algebraic_connectivity:
+            if csr is not None:
+                sub = build_operational_graph(graph)
             # Compute on LCC subgraph only
             if sub.number_of_nodes() > 0:
                 comps = list(nx.connected_components(sub))
@@ -276,7 +487,7 @@ def simulate_dynamic(graph: nx.Graph, params: Optional[DynamicParams] = None, se
                     largest_nodes = list(largest_nodes_iter)
                     lcc_subgraph = sub.subgraph(largest_nodes)
                     try:
-                        rec['algebraic_connectivity'] = float(nx.algebraic_connectivity(lcc_subgraph))
+                        rec['algebraic_connectivity'] = float(nx.algebraic_connectivity(lcc_subgraph, seed=rng))
                     except nx.NetworkXError:
                         rec['algebraic_connectivity'] = 0.0
                 else:
@@ -296,6 +507,10 @@ def simulate_dynamic(graph: nx.Graph, params: Optional[DynamicParams] = None, se
         'ttr_mean': float(np.mean(ttrs)) if ttrs else float('inf'),
         'ttr_median': float(np.median(ttrs)) if ttrs else float('inf'),
     }
+    if cascade is not None:
+        summary['cascade_count'] = len(cascade_sizes)
+        summary['cascade_failures'] = int(sum(cascade_sizes))
+        summary['cascade_max_size'] = max(cascade_sizes, default=0)
 
     df = pd.DataFrame.from_records(records)
     return df, summary
@@ -0,0 +1,275 @@
+import bisect
+import struct
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Set, Tuple
+
+import networkx as nx
+import numpy as np
+
+# -----------------------
+# Binary format
+# -----------------------
+# <path>          : MAGIC followed by fixed-size little-endian records (step u32, kind u8, a u32, b u32)
+# <path>.idx.npz  : topology (nodes, edges, optional pos/level) and the seek index: for every
+#                   snapshot step, the record offset of its first event and the network state
+#                   (offline nodes, dead nodes, down/added/removed edges) right before that step.
+# Node movement (mobile RGG sensors) is not logged; links created or broken by it are.
+
+MAGIC = b'IOTEVLG1'
+RECORD = struct.Struct('<IBII')
+RECORD_DTYPE = np.dtype([('step', '<u4'), ('kind', 'u1'), ('a', '<u4'), ('b', '<u4')])
+
+NODE_FAIL = 1
+NODE_RECOVER = 2
+NODE_DEATH = 3
+LINK_DOWN = 4
+LINK_UP = 5
+LINK_ADDED = 6
+LINK_REMOVED = 7
+
+EVENT_NAMES = {
+    NODE_FAIL: 'node_fail',
+    NODE_RECOVER: 'node_recover',
+    NODE_DEATH: 'node_death',
+    LINK_DOWN: 'link_down',
+    LINK_UP: 'link_up',
+    LINK_ADDED: 'link_added',
+    LINK_REMOVED: 'link_removed',
+}
+
+
+def index_path(path: str) -> str:
+    return path + '.idx.npz'
+
+
+@dataclass
+class NetworkState:
+    offline: Set[int] = field(default_factory=set)
+    dead: Set[int] = field(default_factory=set)
+    down_edges: Set[Tuple[int, int]] = field(default_factory=set)
+    added_edges: Set[Tuple[int, int]] = field(default_factory=set)    # links not in the initial topology
+    removed_edges: Set[Tuple[int, int]] = field(default_factory=set)  # initial links that no longer exist
+
+    def apply(self, kind: int, a: int, b: int):
+        if kind == NODE_FAIL:
+            self.offline.add(a)
+        elif kind == NODE_RECOVER:
+            self.offline.discard(a)
+        elif kind == NODE_DEATH:
+            self.offline.add(a)
+            self.dead.add(a)
+        elif kind == LINK_DOWN:
+            self.down_edges.add((min(a, b), max(a, b)))
+        elif kind == LINK_UP:
+            self.down_edges.discard((min(a, b), max(a, b)))
+        elif kind == LINK_ADDED:
+            e = (min(a, b), max(a, b))
+            self.down_edges.discard(e)
+            if e in self.removed_edges:
+                self.removed_edges.discard(e)
+            else:
+                self.added_edges.add(e)
+        elif kind == LINK_REMOVED:
+            e = (min(a, b), max(a, b))
+            self.down_edges.discard(e)
+            if e in self.added_edges:
+                self.added_edges.discard(e)
+            else:
+                self.removed_edges.add(e)
+        else:
+            raise ValueError(f"Unknown event kind: {kind}")
+
+    def copy(self) -> 'NetworkState':
+        return NetworkState(set(self.offline), set(self.dead), set(self.down_edges),
+                            set(self.added_edges), set(self.removed_edges))
+
+# -----------------------
+# Writer
+# -----------------------
+
+class EventLogWriter:
+    """
+    Append-only event log written by the dynamic simulator. Recording an event is a struct
+    pack into an in-memory buffer; the writer tracks the resulting state itself so snapshots
+    for the seek index do not need to scan the graph.
+    """
+
+    def __init__(self, path: str, graph: nx.Graph, snapshot_interval: int = 100, buffer_bytes: int = 1 << 20):
+        self.path = path
+        self.snapshot_interval = max(1, snapshot_interval)
+        self.buffer_bytes = buffer_bytes
+        self.state = NetworkState()
+        self.step = 0
+        self.num_events = 0
+        self._buffer = bytearray()
+        self._snapshots: List[Tuple[int, int, NetworkState]] = []
+        # Replay rebuilds every step from the initial topology and positions, so they are
+        # captured now, before the simulation moves nodes or adds/removes links
+        self._topology = self._capture_topology(graph)
+        self._file = open(path, 'wb')
+        self._file.write(MAGIC)
+
+    def begin_step(self, step: int):
+        self.step = step
+        if step % self.snapshot_interval == 0:
+            self._snapshots.append((step, self.num_events, self.state.copy()))
+
+    def record(self, kind: int, a: int, b: int = 0):
+        self._buffer += RECORD.pack(self.step, kind, a, b)
+        self.state.apply(kind, a, b)
+        self.num_events += 1
+        if len(self._buffer) >= self.buffer_bytes:
+            self._flush()
+
+    def _flush(self):
+        self._file.write(self._buffer)
+        self._buffer.clear()
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._flush()
+        self._file.close()
+        self._write_index()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @staticmethod
+    def _capture_topology(graph: nx.Graph) -> Dict[str, np.ndarray]:
+        topology = {
+            'nodes': np.fromiter(graph.nodes(), dtype=np.int64, count=graph.number_of_nodes()),
+            'edges': np.array([(min(u, v), max(u, v)) for u, v in graph.edges()], dtype=np.int64).reshape(-1, 2),
+        }
+        data = [d for _, d in graph.nodes(data=True)]
+        if data and all('pos' in d for d in data):
+            topology['pos'] = np.array([d['pos'] for d in data], dtype=float)
+        if data and all('level' in d for d in data):
+            topology['level'] = np.array([d['level'] for d in data], dtype=np.int64)
+        return topology
+
+    def _write_index(self):
+
+        # Snapshot states are concatenated into flat arrays with per-snapshot boundaries
+        offline, dead, down, added, removed, bounds = [], [], [], [], [], []
+        for _, _, st in self._snapshots:
+            offline.append(np.array(sorted(st.offline), dtype=np.int64))
+            dead.append(np.array(sorted(st.dead), dtype=np.int64))
+            down.append(np.array(sorted(st.down_edges), dtype=np.int64).reshape(-1, 2))
+            added.append(np.array(sorted(st.added_edges), dtype=np.int64).reshape(-1, 2))
+            removed.append(np.array(sorted(st.removed_edges), dtype=np.int64).reshape(-1, 2))
+            bounds.append((len(offline[-1]), len(dead[-1]), len(down[-1]), len(added[-1]), len(removed[-1])))
+
+        np.savez_compressed(
+            index_path(self.path),
+            last_step=np.int64(self.step),
+            snapshot_steps=np.array([s for s, _, _ in self._snapshots], dtype=np.int64),
+            snapshot_offsets=np.array([o for _, o, _ in self._snapshots], dtype=np.int64),
+            snapshot_sizes=np.array(bounds, dtype=np.int64).reshape(-1, 5),
+            snapshot_offline=np.concatenate(offline) if offline else np.zeros(0, dtype=np.int64),
+            snapshot_dead=np.concatenate(dead) if dead else np.zeros(0, dtype=np.int64),
+            snapshot_down=np.concatenate(down) if down else np.zeros((0, 2), dtype=np.int64),
+            snapshot_added=np.concatenate(added) if added else np.zeros((0, 2), dtype=np.int64),
+            snapshot_removed=np.concatenate(removed) if removed else np.zeros((0, 2), dtype=np.int64),
+            **self._topology,
+        )
+
+# -----------------------
+# Reader / replay
+# -----------------------
+
+class EventLog:
+    """Random access to a written event log: rebuilds the network state at any step."""
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"'{path}' is not an event log")
+            has_events = bool(f.read(1))
+        if has_events:
+            self.events = np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=len(MAGIC))
+        else:
+            self.events = np.zeros(0, dtype=RECORD_DTYPE)  # memmap cannot map an empty range
+        index = np.load(index_path(path))
+        self.last_step = int(index['last_step'])
+        self.nodes = index['nodes']
+        self.edges = index['edges']
+        self.pos = index['pos'] if 'pos' in index else None
+        self.level = index['level'] if 'level' in index else None
+        self.snapshot_steps = index['snapshot_steps'].tolist()
+        self.snapshot_offsets = index['snapshot_offsets'].tolist()
+        self._snapshots = self._split_snapshots(index)
+
+    @staticmethod
+    def _split_snapshots(index) -> List[NetworkState]:
+        states = []
+        offline, dead = index['snapshot_offline'], index['snapshot_dead']
+        edge_sets = [index['snapshot_down'], index['snapshot_added'], index['snapshot_removed']]
+        starts = np.zeros(5, dtype=np.int64)
+        for sizes in index['snapshot_sizes']:
+            ends = starts + sizes
+            down, added, removed = (
+                {(int(u), int(v)) for u, v in arr[starts[k]:ends[k]]} for k, arr in zip((2, 3, 4), edge_sets)
+            )
+            states.append(NetworkState(
+                offline=set(offline[starts[0]:ends[0]].tolist()),
+                dead=set(dead[starts[1]:ends[1]].tolist()),
+                down_edges=down,
+                added_edges=added,
+                removed_edges=removed,
+            ))
+            starts = ends
+        return states
+
+    def graph(self) -> nx.Graph:
+        """Topology with the node attributes the model visualizers use (pos, level)."""
+        G = nx.Graph()
+        G.add_nodes_from(self.nodes.tolist())
+        G.add_edges_from(self.edges.tolist())
+        if self.pos is not None:
+            for n, p in zip(self.nodes.tolist(), self.pos):
+                G.nodes[n]['pos'] = tuple(p)
+        if self.level is not None:
+            for n, lv in zip(self.nodes.tolist(), self.level.tolist()):
+                G.nodes[n]['level'] = lv
+        return G
+
+    def _event_range(self, after_step: int) -> int:
+        """Record offset just past the last event with step <= after_step."""
+        return int(np.searchsorted(self.events['step'], after_step, side='right'))
+
+    def state_at(self, step: int) -> NetworkState:
+        """
+        State after all events of `step`, rebuilt from the nearest snapshot at or before it,
+        i.e. in O(events since that snapshot).
+        """
+        i = bisect.bisect_right(self.snapshot_steps, step) - 1
+        if i >= 0:
+            state, start = self._snapshots[i].copy(), self.snapshot_offsets[i]
+        else:
+            state, start = NetworkState(), 0
+        self._apply(state, start, self._event_range(step))
+        return state
+
+    def replay(self, start: int, stop: int, every: int = 1) -> Iterator[Tuple[int, NetworkState]]:
+        """Yields (step, state) for start..stop in increments of `every`, moving forward incrementally."""
+        state = self.state_at(start)
+        position = self._event_range(start)
+        for step in range(start, stop + 1, max(1, every)):
+            end = self._event_range(step)
+            self._apply(state, position, end)
+            position = end
+            yield step, state
+
+    def _apply(self, state: NetworkState, start: int, end: int):
+        chunk = self.events[start:end]
+        for kind, a, b in zip(chunk['kind'].tolist(), chunk['a'].tolist(), chunk['b'].tolist()):
+            state.apply(kind, a, b)
+
+    def event_counts(self) -> Dict[str, int]:
+        kinds, counts = np.unique(self.events['kind'], return_counts=True)
+        return {EVENT_NAMES.get(int(k), str(k)): int(c) for k, c in zip(kinds, counts)}
+
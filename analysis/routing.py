@@ -0,0 +1,203 @@
+import heapq
+from collections import deque
+from typing import Dict, List, Optional, Set
+
+import networkx as nx
+
+INF = float('inf')
+
+# -----------------------
+# Sink / gateway selection
+# -----------------------
+
+def sink_nodes(graph: nx.Graph, target: str = 'sink') -> List[int]:
+    """
+    Returns the traffic destinations of the network.
+    - 'sink': nodes labelled 'Sink'
+    - 'gateway': nodes labelled 'Sink' or 'Gateway' (packets go to the nearest one)
+    Graphs without labels (ER, BA, WS, RGG) fall back to the highest-degree node as sink.
+    """
+    if target == 'sink':
+        labels = {'Sink'}
+    elif target == 'gateway':
+        labels = {'Sink', 'Gateway'}
+    else:
+        raise ValueError(f"Unknown traffic target: {target}")
+
+    sinks = [n for n, d in graph.nodes(data=True) if d.get('label') in labels]
+    if sinks:
+        return sinks
+    if graph.number_of_nodes() == 0:
+        return []
+    return [max(graph.nodes(), key=lambda n: (graph.degree(n), -n))]
+
+
+def sensor_nodes(graph: nx.Graph, sinks: List[int]) -> List[int]:
+    """Traffic sources: nodes labelled 'Sensor', or every non-sink node if the graph is unlabelled."""
+    sensors = [n for n, d in graph.nodes(data=True) if d.get('label') == 'Sensor']
+    if sensors:
+        return sensors
+    sink_set = set(sinks)
+    return [n for n in graph.nodes() if n not in sink_set]
+
+# -----------------------
+# Shortest-path tree towards the sinks
+# -----------------------
+
+class SinkTreeRouter:
+    """
+    Maintains a shortest-path forest rooted at the (online) sinks over the operational graph.
+    Every node stores its hop distance to the nearest sink and the next hop towards it, so a
+    route is read off in O(path length). Node and link state changes repair only the affected
+    part of the forest instead of recomputing it.
+    """
+
+    def __init__(self, graph: nx.Graph, sinks: List[int]):
+        self.graph = graph
+        self.sinks: Set[int] = set(sinks)
+        self.dist: Dict[int, float] = {}
+        self.parent: Dict[int, Optional[int]] = {}
+        self.children: Dict[int, Set[int]] = {}
+        self.rebuild()
+
+    # --- operational state (read from the graph attributes used by the simulator) ---
+
+    def _online(self, n: int) -> bool:
+        return self.graph.nodes[n].get('online', True)
+
+    def _edge_up(self, u: int, v: int) -> bool:
+        return self.graph.edges[u, v].get('up', True)
+
+    def _usable_neighbors(self, n: int):
+        for w in self.graph.neighbors(n):
+            if self._online(w) and self._edge_up(n, w):
+                yield w
+
+    # --- tree bookkeeping ---
+
+    def _set_parent(self, n: int, p: Optional[int]):
+        old = self.parent.get(n)
+        if old is not None:
+            self.children[old].discard(n)
+        self.parent[n] = p
+        if p is not None:
+            self.children.setdefault(p, set()).add(n)
+
+    def _detach_subtree(self, root: int) -> List[int]:
+        """Unreaches root and all its descendants, returning them."""
+        orphans = []
+        stack = [root]
+        while stack:
+            n = stack.pop()
+            orphans.append(n)
+            stack.extend(self.children.get(n, ()))
+        for n in orphans:
+            self._set_parent(n, None)
+            self.dist[n] = INF
+        return orphans
+
+    def rebuild(self):
+        """Full multi-source BFS from the online sinks."""
+        self.dist = {n: INF for n in self.graph.nodes()}
+        self.parent = {n: None for n in self.graph.nodes()}
+        self.children = {n: set() for n in self.graph.nodes()}
+        queue = deque()
+        for s in self.sinks:
+            if s in self.dist and self._online(s):
+                self.dist[s] = 0
+                queue.append(s)
+        while queue:
+            u = queue.popleft()
+            for w in self._usable_neighbors(u):
+                if self.dist[w] == INF:
+                    self.dist[w] = self.dist[u] + 1
+                    self._set_parent(w, u)
+                    queue.append(w)
+
+    def _reattach(self, orphans: List[int]):
+        """
+        Re-routes detached nodes. Distances outside the orphan set are still exact, so the
+        orphans are settled by a unit-weight Dijkstra seeded from their reached neighbours.
+        """
+        heap = []
+        for n in orphans:
+            if not self._online(n):
+                continue
+            if n in self.sinks:
+                heapq.heappush(heap, (0, n, None))
+                continue
+            for w in self._usable_neighbors(n):
+                if self.dist[w] < INF:
+                    heapq.heappush(heap, (self.dist[w] + 1, n, w))
+        while heap:
+            d, n, p = heapq.heappop(heap)
+            if d >= self.dist[n]:
+                continue
+            self.dist[n] = d
+            self._set_parent(n, p)
+            for w in self._usable_neighbors(n):
+                if self.dist[w] > d + 1:
+                    heapq.heappush(heap, (d + 1, w, n))
+
+    def _relax_from(self, n: int):
+        """Propagates a distance improvement at n through the forest (unit-weight BFS)."""
+        queue = deque([n])
+        while queue:
+            u = queue.popleft()
+            for w in self._usable_neighbors(u):
+                if self.dist[w] > self.dist[u] + 1:
+                    self.dist[w] = self.dist[u] + 1
+                    self._set_parent(w, u)
+                    queue.append(w)
+
+    # --- state change notifications ---
+
+    def node_down(self, n: int):
+        if self.dist.get(n, INF) == INF and not self.children.get(n):
+            return
+        self._reattach(self._detach_subtree(n))
+
+    def edge_down(self, u: int, v: int):
+        if self.parent.get(v) == u:
+            self._reattach(self._detach_subtree(v))
+        elif self.parent.get(u) == v:
+            self._reattach(self._detach_subtree(u))
+
+    def node_up(self, n: int):
+        if not self._online(n):
+            return
+        if n in self.sinks:
+            self._set_parent(n, None)
+            self.dist[n] = 0
+        else:
+            best = min(self._usable_neighbors(n), key=lambda w: self.dist[w], default=None)
+            if best is None or self.dist[best] + 1 >= self.dist[n]:
+                return
+            self.dist[n] = self.dist[best] + 1
+            self._set_parent(n, best)
+        self._relax_from(n)
+
+    def edge_up(self, u: int, v: int):
+        if not (self._online(u) and self._online(v)):
+            return
+        if self.dist[u] + 1 < self.dist[v]:
+            self.dist[v] = self.dist[u] + 1
+            self._set_parent(v, u)
+            self._relax_from(v)
+        elif self.dist[v] + 1 < self.dist[u]:
+            self.dist[u] = self.dist[v] + 1
+            self._set_parent(u, v)
+            self._relax_from(u)
+
+    # --- queries ---
+
+    def path(self, source: int) -> Optional[List[int]]:
+        """Route from source to its nearest sink, or None if no sink is reachable."""
+        if self.dist.get(source, INF) == INF:
+            return None
+        path = [source]
+        n = source
+        while self.parent[n] is not None:
+            n = self.parent[n]
+            path.append(n)
+        return path
@@ -0,0 +1,228 @@
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+import networkx as nx
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse import csgraph
+
+# -----------------------
+# Masked CSR adjacency
+# -----------------------
+
+class MaskedCSR:
+    """
+    Static CSR adjacency of a graph plus alive masks for nodes ('online') and edges ('up').
+    Failures and recoveries only flip mask bits; the arrays are rebuilt only when the
+    topology itself changes (e.g. links created or broken by mobile nodes).
+    Every undirected edge is stored as two CSR entries that share one edge id.
+    """
+
+    def __init__(self, graph: nx.Graph):
+        self.rebuild(graph)
+
+    def rebuild(self, graph: nx.Graph):
+        """(Re)reads topology and alive state from the graph attributes used by the simulator."""
+        self.nodes: List[Hashable] = list(graph.nodes())
+        self.index: Dict[Hashable, int] = {n: i for i, n in enumerate(self.nodes)}
+        n = len(self.nodes)
+
+        edge_list = list(graph.edges())
+        m = len(edge_list)
+        eu = np.fromiter((self.index[u] for u, _ in edge_list), dtype=np.int64, count=m)
+        ev = np.fromiter((self.index[v] for _, v in edge_list), dtype=np.int64, count=m)
+        rows = np.concatenate([eu, ev])
+        cols = np.concatenate([ev, eu])
+        eid = np.concatenate([np.arange(m), np.arange(m)])
+        order = np.lexsort((cols, rows))
+
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=self.indptr[1:])
+        self.indices = cols[order]
+        self.entry_edge = eid[order]
+        self.entry_row = rows[order]
+        self.edge_id: Dict[Tuple[Hashable, Hashable], int] = {}
+        for i, (u, v) in enumerate(edge_list):
+            self.edge_id[(u, v)] = i
+            self.edge_id[(v, u)] = i
+
+        self.node_alive = np.fromiter((d.get('online', True) for _, d in graph.nodes(data=True)), dtype=bool, count=n)
+        self.edge_alive = np.fromiter((d.get('up', True) for _, _, d in graph.edges(data=True)), dtype=bool, count=m)
+        self._entry_alive: Optional[np.ndarray] = None
+        self._matrix: Optional[sp.csr_matrix] = None
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.nodes)
+
+    def set_node(self, node: Hashable, alive: bool):
+        self.node_alive[self.index[node]] = alive
+        self._entry_alive = self._matrix = None
+
+    def set_edge(self, u: Hashable, v: Hashable, alive: bool):
+        self.edge_alive[self.edge_id[(u, v)]] = alive
+        self._entry_alive = self._matrix = None
+
+    @property
+    def entry_alive(self) -> np.ndarray:
+        """Per CSR entry: both endpoints online and the link up (cached until the next mask change)."""
+        if self._entry_alive is None:
+            self._entry_alive = (self.node_alive[self.entry_row] & self.node_alive[self.indices]
+                                 & self.edge_alive[self.entry_edge])
+        return self._entry_alive
+
+    def alive_nodes(self) -> List[Hashable]:
+        """Online nodes in graph order (the order operational_nodes() returns them in)."""
+        return [self.nodes[i] for i in np.flatnonzero(self.node_alive)]
+
+    def matrix(self) -> sp.csr_matrix:
+        """Operational adjacency as a SciPy CSR matrix (dead entries dropped), for scipy.sparse.csgraph."""
+        if self._matrix is None:
+            keep = self.entry_alive
+            n = self.num_nodes
+            self._matrix = sp.csr_matrix(
+                (np.ones(int(keep.sum()), dtype=np.int8), (self.entry_row[keep], self.indices[keep])), shape=(n, n)
+            )
+        return self._matrix
+
+# -----------------------
+# Frontier BFS
+# -----------------------
+
+def _expand(csr: MaskedCSR, frontier: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    All alive CSR entries leaving the frontier nodes, as (position in frontier, neighbour).
+    The per-node entry ranges are concatenated with one repeat/arange, without a Python loop.
+    """
+    starts = csr.indptr[frontier]
+    counts = csr.indptr[frontier + 1] - starts
+    owner = np.repeat(np.arange(len(frontier)), counts)
+    offsets = np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)
+    entries = np.repeat(starts, counts) + offsets
+    alive = csr.entry_alive[entries]
+    return owner[alive], csr.indices[entries[alive]]
+
+
+def batched_bfs(
+        csr: MaskedCSR,
+        sources: Sequence[int],
+        targets: Optional[Sequence[int]] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Independent level-synchronous BFS from every source (node indices), advanced together:
+    the frontier is a set of (search, node) pairs and each level is one vectorized expansion.
+    Returns (dist, parent) arrays of shape (len(sources), n) with -1 for unreached nodes.
+    With targets (one per source) the search stops once every target is reached.
+    """
+    k, n = len(sources), csr.num_nodes
+    dist = np.full(k * n, -1, dtype=np.int64)
+    parent = np.full(k * n, -1, dtype=np.int64)
+    src = np.asarray(sources, dtype=np.int64)
+    live = csr.node_alive[src] if k else np.zeros(0, dtype=bool)
+    search, frontier = np.flatnonzero(live), src[live]
+    dist[search * n + frontier] = 0
+    target_keys = None if targets is None else np.arange(k) * n + np.asarray(targets, dtype=np.int64)
+
+    level = 0
+    while len(frontier):
+        if target_keys is not None and np.all(dist[target_keys] >= 0):
+            break
+        level += 1
+        owner, nbrs = _expand(csr, frontier)
+        keys = search[owner] * n + nbrs
+        fresh = dist[keys] < 0
+        keys, came_from = keys[fresh], frontier[owner[fresh]]
+        keys, first = np.unique(keys, return_index=True)  # one parent per newly reached node
+        dist[keys] = level
+        parent[keys] = came_from[first]
+        search, frontier = keys // n, keys % n
+    return dist.reshape(k, n), parent.reshape(k, n)
+
+
+def multi_source_bfs(csr: MaskedCSR, sources: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    One BFS started from all sources at once (shared visited set): distance to, and index of,
+    the nearest source for every node (-1 if unreachable).
+    """
+    n = csr.num_nodes
+    dist = np.full(n, -1, dtype=np.int64)
+    nearest = np.full(n, -1, dtype=np.int64)
+    frontier = np.asarray([s for s in sources if csr.node_alive[s]], dtype=np.int64)
+    frontier = np.unique(frontier)
+    dist[frontier] = 0
+    nearest[frontier] = frontier
+
+    level = 0
+    while len(frontier):
+        level += 1
+        owner, nbrs = _expand(csr, frontier)
+        fresh = dist[nbrs] < 0
+        nbrs, came_from = nbrs[fresh], frontier[owner[fresh]]
+        nbrs, first = np.unique(nbrs, return_index=True)
+        dist[nbrs] = level
+        nearest[nbrs] = nearest[came_from[first]]
+        frontier = nbrs
+    return dist, nearest
+
+
+def _trace(parent: np.ndarray, target: int) -> List[int]:
+    path = [target]
+    while parent[path[-1]] >= 0:
+        path.append(int(parent[path[-1]]))
+    path.reverse()
+    return path
+
+
+def shortest_paths(csr: MaskedCSR, pairs: Sequence[Tuple[Hashable, Hashable]]) -> List[Optional[List[Hashable]]]:
+    """Shortest paths (as node labels) for a batch of (source, target) pairs; None where unreachable."""
+    if not pairs:
+        return []
+    sources = [csr.index[s] for s, _ in pairs]
+    targets = [csr.index[t] for _, t in pairs]
+    dist, parent = batched_bfs(csr, sources, targets)
+    paths: List[Optional[List[Hashable]]] = []
+    for i, t in enumerate(targets):
+        if dist[i, t] < 0:
+            paths.append(None)
+        else:
+            paths.append([csr.nodes[j] for j in _trace(parent[i], t)])
+    return paths
+
+# -----------------------
+# Connected components
+# -----------------------
+
+def label_propagation_components(csr: MaskedCSR) -> np.ndarray:
+    """
+    Component labels by min-label propagation over the alive entries with pointer jumping
+    (each label is a node index, so labels[labels] shortcuts chains). Offline nodes get -1.
+    """
+    labels = np.arange(csr.num_nodes, dtype=np.int64)
+    alive = csr.entry_alive
+    rows, cols = csr.entry_row[alive], csr.indices[alive]
+    while True:
+        new = labels.copy()
+        np.minimum.at(new, rows, labels[cols])
+        new = new[new]
+        if np.array_equal(new, labels):
+            break
+        labels = new
+    labels[~csr.node_alive] = -1
+    return labels
+
+
+def component_labels(csr: MaskedCSR, method: str = 'csgraph') -> np.ndarray:
+    """Component label per node (-1 for offline nodes), via scipy.sparse.csgraph or label propagation."""
+    if method == 'label_propagation':
+        return label_propagation_components(csr)
+    if method != 'csgraph':
+        raise ValueError(f"Unknown components method: {method}")
+    _, labels = csgraph.connected_components(csr.matrix(), directed=False)
+    labels = labels.astype(np.int64)
+    labels[~csr.node_alive] = -1
+    return labels
+
+
+def largest_component_size(csr: MaskedCSR, method: str = 'csgraph') -> int:
+    labels = component_labels(csr, method)
+    labels = labels[labels >= 0]
+    return int(np.bincount(labels).max()) if len(labels) else 0
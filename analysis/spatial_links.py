@@ -0,0 +1,297 @@
+import math
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import networkx as nx
+import numpy as np
+
+Cell = Tuple[int, int]
+Edge = Tuple[int, int]
+
+# -----------------------
+# Uniform grid spatial index
+# -----------------------
+
+class SpatialGrid:
+    """
+    Uniform grid over node positions. With the cell size set to the communication radius,
+    every neighbour of a node lies in its own or one of the 8 surrounding cells, so range
+    queries touch O(local density) nodes instead of all of them.
+    """
+
+    def __init__(self, cell_size: float):
+        self.cell_size = cell_size
+        self.cells: Dict[Cell, Set[int]] = defaultdict(set)
+        self.node_cell: Dict[int, Cell] = {}
+        self.pos: Dict[int, Tuple[float, float]] = {}
+
+    def cell_of(self, p: Tuple[float, float]) -> Cell:
+        return int(math.floor(p[0] / self.cell_size)), int(math.floor(p[1] / self.cell_size))
+
+    def insert(self, n: int, p: Tuple[float, float]):
+        c = self.cell_of(p)
+        self.cells[c].add(n)
+        self.node_cell[n] = c
+        self.pos[n] = p
+
+    def move(self, n: int, p: Tuple[float, float]) -> bool:
+        """Updates a node position; returns True if it changed cells."""
+        old, new = self.node_cell[n], self.cell_of(p)
+        self.pos[n] = p
+        if old == new:
+            return False
+        self.cells[old].discard(n)
+        if not self.cells[old]:
+            del self.cells[old]
+        self.cells[new].add(n)
+        self.node_cell[n] = new
+        return True
+
+    def cells_around(self, c: Cell, radius: float) -> Iterable[Cell]:
+        r = int(math.ceil(radius / self.cell_size))
+        for dx in range(-r, r + 1):
+            for dy in range(-r, r + 1):
+                yield c[0] + dx, c[1] + dy
+
+    def query(self, p: Tuple[float, float], radius: float) -> List[int]:
+        """Nodes within radius of point p."""
+        r2 = radius * radius
+        found = []
+        for c in self.cells_around(self.cell_of(p), radius):
+            for n in self.cells.get(c, ()):
+                q = self.pos[n]
+                if (q[0] - p[0]) ** 2 + (q[1] - p[1]) ** 2 <= r2:
+                    found.append(n)
+        return found
+
+# -----------------------
+# Distance- and density-dependent link reliability
+# -----------------------
+
+@dataclass
+class SpatialLinkParams:
+    radius: Optional[float] = None     # communication radius; inferred from the longest edge if None
+    path_loss_exponent: float = 2.0    # shape of the distance penalty (d / radius) ** exponent
+    range_factor: float = 4.0          # flip prob multiplier at the edge of the range is (1 + range_factor)
+    interference_range: float = 2.0   # interference disc radius, in multiples of the radius
+    interference_factor: float = 1.0   # extra flip prob per interferer, relative to the expected count
+    mobility_fraction: float = 0.0     # fraction of nodes that move each step
+    mobility_step: float = 0.01        # maximum displacement per coordinate and step
+
+
+def edge_key(u: int, v: int) -> Edge:
+    return (u, v) if u <= v else (v, u)
+
+
+class SpatialLinkModel:
+    """
+    Replaces the flat per-edge flip probability for graphs with node positions ('pos', as
+    stored by nx.random_geometric_graph). A link goes down with probability
+
+        base * (1 + range_factor * (d / radius) ** exponent) * (1 + interference_factor * k / k_expected)
+
+    where d is the link length and k the number of other nodes within the interference disc
+    around the link midpoint. Lengths and interferer counts are cached per link; when nodes
+    move, links touching a mover are recomputed, all others only get their count adjusted by
+    the movers entering/leaving their disc, and links are added/removed through grid range
+    queries instead of regenerating the graph.
+    """
+
+    def __init__(
+            self,
+            graph: nx.Graph,
+            base_flip_prob: float,
+            down_steps: int,
+            params: Optional[SpatialLinkParams] = None,
+            rng: Optional[np.random.Generator] = None,
+    ):
+        self.graph = graph
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.base = base_flip_prob
+        self.down_steps = down_steps
+        self.params = params or SpatialLinkParams()
+
+        positions = {n: tuple(d['pos']) for n, d in graph.nodes(data=True)}
+        self.radius = self.params.radius or max(
+            (math.dist(positions[u], positions[v]) for u, v in graph.edges()), default=0.0
+        ) or 1.0
+        self.interference_radius = self.params.interference_range * self.radius
+
+        self.grid = SpatialGrid(self.radius)
+        for n, p in positions.items():
+            self.grid.insert(n, p)
+
+        n = graph.number_of_nodes()
+        area = math.pi * self.interference_radius ** 2
+        self.expected_interferers = max((n - 2) * min(area, 1.0), 1e-12)  # nodes live in the unit square
+
+        # Links are stored in parallel arrays (grown by doubling, valid prefix of len(edges));
+        # removal swaps with the last slot
+        self.edges: List[Edge] = []
+        self.slot: Dict[Edge, int] = {}
+        capacity = max(2 * graph.number_of_edges(), 16)
+        self.prob = np.zeros(capacity)
+        self.up = np.ones(capacity, dtype=bool)
+        self.timer = np.zeros(capacity, dtype=np.int64)
+        self.length = np.zeros(capacity)
+        self.interferers = np.zeros(capacity, dtype=np.int64)
+        self.mid = np.zeros((capacity, 2))
+        self.mid_cell_edges: Dict[Cell, Set[Edge]] = defaultdict(set)
+        self.edge_mid_cell: Dict[Edge, Cell] = {}
+        for u, v in graph.edges():
+            self._add_slot(edge_key(u, v))
+        self._recompute(self.edges)
+
+    # --- per-link bookkeeping ---
+
+    _ARRAYS = ('prob', 'up', 'timer', 'length', 'interferers', 'mid')
+
+    def _add_slot(self, e: Edge):
+        i = len(self.edges)
+        if i == len(self.prob):
+            for name in self._ARRAYS:
+                arr = getattr(self, name)
+                setattr(self, name, np.concatenate([arr, np.zeros_like(arr)]))
+        self.slot[e] = i
+        self.edges.append(e)
+        self.prob[i], self.up[i], self.timer[i] = 0.0, True, 0
+        self._index_midpoint(e)
+
+    def _index_midpoint(self, e: Edge):
+        a, b = self.grid.pos[e[0]], self.grid.pos[e[1]]
+        mid = ((a[0] + b[0]) / 2.0, (a[1] + b[1]) / 2.0)
+        self.mid[self.slot[e]] = mid
+        c = self.grid.cell_of(mid)
+        old = self.edge_mid_cell.get(e)
+        if old is not None:
+            self.mid_cell_edges[old].discard(e)
+        self.mid_cell_edges[c].add(e)
+        self.edge_mid_cell[e] = c
+
+    def _remove_slot(self, e: Edge):
+        i = self.slot.pop(e)
+        last = len(self.edges) - 1
+        if i != last:
+            moved = self.edges[last]
+            self.edges[i] = moved
+            self.slot[moved] = i
+            for name in self._ARRAYS:
+                arr = getattr(self, name)
+                arr[i] = arr[last]
+        self.edges.pop()
+        self.mid_cell_edges[self.edge_mid_cell.pop(e)].discard(e)
+
+    def _recompute(self, edges: Iterable[Edge]):
+        """Full recomputation (length, midpoint, interferer count) for links whose endpoints moved."""
+        slots = []
+        for e in edges:
+            u, v = e
+            i = self.slot[e]
+            self._index_midpoint(e)
+            self.length[i] = math.dist(self.grid.pos[u], self.grid.pos[v])
+            self.interferers[i] = sum(1 for w in self.grid.query(tuple(self.mid[i]), self.interference_radius)
+                                      if w != u and w != v)
+            slots.append(i)
+        self._update_probability(np.asarray(slots, dtype=np.int64))
+
+    def _update_probability(self, slots: np.ndarray):
+        p = self.base * (1.0 + self.params.range_factor * (self.length[slots] / self.radius) ** self.params.path_loss_exponent)
+        p *= 1.0 + self.params.interference_factor * self.interferers[slots] / self.expected_interferers
+        self.prob[slots] = np.minimum(p, 1.0)
+
+    def link_probability(self, e: Edge) -> float:
+        return float(self.prob[self.slot[e]])
+
+    # --- dynamics ---
+
+    def step(self) -> Tuple[List[Edge], List[Edge]]:
+        """
+        Same semantics as step_link_instability (a flip resets the down timer, down links
+        count down and come back up), with per-link probabilities and vectorized draws.
+        Returns the links that went down and came back up.
+        """
+        m = len(self.edges)
+        if m == 0 or self.base <= 0:
+            return [], []
+        prob, up, timer = self.prob[:m], self.up[:m], self.timer[:m]  # views
+        flip = self.rng.random(m) < prob
+        went_down_idx = np.flatnonzero(flip & up)
+        counting = ~flip & ~up & (timer > 0)
+        timer[counting] -= 1
+        came_up_idx = np.flatnonzero(counting & (timer == 0))
+
+        up[flip] = False
+        timer[flip] = self.down_steps
+        up[came_up_idx] = True
+
+        went_down = [self.edges[i] for i in went_down_idx]
+        came_up = [self.edges[i] for i in came_up_idx]
+        for u, v in went_down:
+            self.graph.edges[u, v]['up'] = False
+        for u, v in came_up:
+            self.graph.edges[u, v]['up'] = True
+        return went_down, came_up
+
+    def move_nodes(self) -> Tuple[List[Edge], List[Edge]]:
+        """
+        Moves a random fraction of nodes by a bounded random displacement (clipped to the
+        unit square), then repairs the topology around them only. Returns (added, removed) links.
+        """
+        n_move = int(round(self.params.mobility_fraction * self.graph.number_of_nodes()))
+        if n_move <= 0:
+            return [], []
+        nodes = list(self.graph.nodes())
+        movers = [nodes[i] for i in self.rng.choice(len(nodes), size=n_move, replace=False)]
+        deltas = self.rng.uniform(-self.params.mobility_step, self.params.mobility_step, size=(n_move, 2))
+
+        old_pos = {}
+        for n, (dx, dy) in zip(movers, deltas):
+            x, y = self.grid.pos[n]
+            p = (min(max(x + dx, 0.0), 1.0), min(max(y + dy, 0.0), 1.0))
+            old_pos[n] = (x, y)
+            self.grid.move(n, p)
+            self.graph.nodes[n]['pos'] = p
+
+        added: List[Edge] = []
+        removed: List[Edge] = []
+        for n in movers:
+            p = self.grid.pos[n]
+            for w in list(self.graph.neighbors(n)):
+                if math.dist(p, self.grid.pos[w]) > self.radius:
+                    e = edge_key(n, w)
+                    self.graph.remove_edge(n, w)
+                    self._remove_slot(e)
+                    removed.append(e)
+            for w in self.grid.query(p, self.radius):
+                if w != n and not self.graph.has_edge(n, w):
+                    e = edge_key(n, w)
+                    self.graph.add_edge(n, w, up=True, down_timer=0)
+                    self._add_slot(e)
+                    added.append(e)
+
+        # Links touching a mover changed length and midpoint: recompute them outright
+        touched = {edge_key(n, w) for n in movers for w in self.graph.neighbors(n)}
+        self._recompute(touched)
+
+        # Every other link only sees movers entering or leaving its interference disc
+        r2 = self.interference_radius ** 2
+        changed: Set[int] = set()
+        for n in movers:
+            p0, p1 = old_pos[n], self.grid.pos[n]
+            cells = set(self.grid.cells_around(self.grid.cell_of(p0), self.interference_radius))
+            cells.update(self.grid.cells_around(self.grid.cell_of(p1), self.interference_radius))
+            slots = np.fromiter((self.slot[e] for c in cells for e in self.mid_cell_edges.get(c, ()) if e not in touched),
+                                dtype=np.int64)
+            if not len(slots):
+                continue
+            mid = self.mid[slots]
+            inside_before = ((mid - p0) ** 2).sum(axis=1) <= r2
+            inside_after = ((mid - p1) ** 2).sum(axis=1) <= r2
+            delta = inside_after.astype(np.int64) - inside_before
+            hit = delta != 0
+            self.interferers[slots[hit]] += delta[hit]
+            changed.update(slots[hit].tolist())
+        if changed:
+            self._update_probability(np.fromiter(changed, dtype=np.int64))
+        return added, removed
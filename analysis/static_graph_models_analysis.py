@@ -1,12 +1,11 @@
 import networkx as nx
-import random
 import numpy as np
-from typing import List, Dict
+from typing import List, Dict, Optional
 
-def calculate_algebraic_connectivity(graph: nx.Graph) -> float:
+def calculate_algebraic_connectivity(graph: nx.Graph, seed=None) -> float:
     """
     Calculates the algebraic connectivity (Fiedler value) of the graph.
-    Returns 0 if the graph is not connected.
+    Returns 0 if the graph is not connected. seed fixes the eigensolver's start vector.
     """
     if not nx.is_connected(graph):
         return 0.0
@@ -14,7 +13,7 @@ def calculate_algebraic_connectivity(graph: nx.Graph) -> float:
     try:
         # Use a faster, approximate method if needed for large graphs
         # For now, the exact method is fine.
-        return nx.algebraic_connectivity(graph)
+        return nx.algebraic_connectivity(graph, seed=seed)
     except nx.NetworkXError:
         return 0.0
 
@@ -39,29 +38,45 @@ def calculate_signal_smoothness(graph: nx.Graph, signal: Dict) -> float:
     return smoothness
 
 
-def simulate_attack(graph: nx.Graph, strategy: str) -> Dict[str, List[float]]:
+# The smoothness signal is the same for every run, so it gets its own fixed stream
+SIGNAL_SEED = 42
+
+
+def attack_order(graph: nx.Graph, strategy: str, rng: Optional[np.random.Generator] = None) -> List:
+    """
+    Returns the order in which an attack removes the nodes.
+    Targeted orders are computed once on the intact graph (non-adaptive attack).
+    """
+    if strategy == 'random':
+        rng = rng if rng is not None else np.random.default_rng()
+        nodes = list(graph.nodes())
+        nodes_to_remove = [nodes[i] for i in rng.permutation(len(nodes))]
+    elif strategy == 'targeted_degree':
+        nodes_to_remove = sorted(graph.nodes(), key=lambda n: graph.degree(n), reverse=True)
+    elif strategy == 'targeted_centrality':
+        centrality = nx.betweenness_centrality(graph)
+        nodes_to_remove = sorted(centrality, key=centrality.get, reverse=True)
+    else:
+        raise ValueError(f"Unknown attack strategy: {strategy}")
+    return nodes_to_remove
+
+
+def simulate_attack(graph: nx.Graph, strategy: str, rng: Optional[np.random.Generator] = None) -> Dict[str, List[float]]:
     """
     Simulates an attack, returning the evolution of multiple metrics.
     Returns a dictionary containing lists for 'lcc' and 'smoothness'.
+    Random choices draw from rng (a fresh unseeded stream if None); no global RNG is touched.
     """
     g = graph.copy()
     n_initial = len(g.nodes())
+    rng = rng if rng is not None else np.random.default_rng()
 
     # Create a simple, static graph signal for the smoothness calculation
     # In a real scenario, this would be sensor data (e.g., temperature).
-    np.random.seed(42)
-    static_signal = {node: np.random.rand() for node in g.nodes()}
+    signal_rng = np.random.default_rng(SIGNAL_SEED)
+    static_signal = {node: signal_rng.random() for node in g.nodes()}
 
-    if strategy == 'random':
-        nodes_to_remove = list(g.nodes())
-        random.shuffle(nodes_to_remove)
-    elif strategy == 'targeted_degree':
-        nodes_to_remove = sorted(g.nodes(), key=lambda n: g.degree(n), reverse=True)
-    elif strategy == 'targeted_centrality':
-        centrality = nx.betweenness_centrality(g)
-        nodes_to_remove = sorted(centrality, key=centrality.get, reverse=True)
-    else:
-        raise ValueError(f"Unknown attack strategy: {strategy}")
+    nodes_to_remove = attack_order(g, strategy, rng)
 
     # --- Initialize lists to store the history of each metric ---
     results = {
@@ -75,7 +90,7 @@ def simulate_attack(graph: nx.Graph, strategy: str) -> Dict[str, List[float]]:
         initial_lcc_graph = g.subgraph(max(nx.connected_components(g), key=len)).copy()
         results['lcc'].append(len(initial_lcc_graph) / n_initial)
         results['smoothness'].append(calculate_signal_smoothness(initial_lcc_graph, static_signal))
-        results['algebraic_connectivity'].append(calculate_algebraic_connectivity(initial_lcc_graph))
+        results['algebraic_connectivity'].append(calculate_algebraic_connectivity(initial_lcc_graph, rng))
     else: # Handle case of empty graph
         results['lcc'].append(0)
         results['smoothness'].append(0)
@@ -96,6 +111,82 @@ def simulate_attack(graph: nx.Graph, strategy: str) -> Dict[str, List[float]]:
 
         results['lcc'].append(len(lcc_subgraph) / n_initial)
         results['smoothness'].append(calculate_signal_smoothness(lcc_subgraph, static_signal))
-        results['algebraic_connectivity'].append(calculate_algebraic_connectivity(lcc_subgraph))
+        results['algebraic_connectivity'].append(calculate_algebraic_connectivity(lcc_subgraph, rng))
 
     return results
+
+
+def percolation_lcc_curve(graph: nx.Graph, nodes_to_remove: List) -> List[float]:
+    """
+    LCC fraction after each removal of nodes_to_remove (same layout as simulate_attack's 'lcc':
+    the initial state first), computed by adding the nodes back in reverse order into a
+    union-find. Costs O(E * alpha(N)) instead of one connected-components pass per step.
+    """
+    n_initial = graph.number_of_nodes()
+    if n_initial == 0:
+        return [0.0]
+
+    parent: Dict = {}
+    size: Dict = {}
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]  # path halving
+            x = parent[x]
+        return x
+
+    largest = 0
+    sizes_reversed = [0]  # LCC size once every node has been removed
+    for node in reversed(nodes_to_remove):
+        parent[node] = node
+        size[node] = 1
+        root = node
+        for nbr in graph.neighbors(node):
+            if nbr not in parent:
+                continue
+            other = find(nbr)
+            if other == root:
+                continue
+            if size[root] < size[other]:
+                root, other = other, root
+            parent[other] = root
+            size[root] += size[other]
+        largest = max(largest, size[root])
+        sizes_reversed.append(largest)
+
+    return [s / n_initial for s in reversed(sizes_reversed)]
+
+
+def r_index(lcc: List[float]) -> float:
+    """
+    Schneider et al. robustness R = (1/N) * sum_{q=1..N} s(q): the mean LCC fraction over all
+    removal steps, excluding the intact initial state.
+    """
+    return float(np.mean(lcc[1:])) if len(lcc) > 1 else 0.0
+
+
+def critical_fraction(lcc: List[float], threshold: float) -> float:
+    """First removed fraction at which the LCC fraction drops below threshold (1.0 if it never does)."""
+    n = len(lcc) - 1
+    for step, value in enumerate(lcc):
+        if value < threshold:
+            return step / n if n > 0 else 0.0
+    return 1.0
+
+
+def robustness_summary(results: Dict[str, List[float]], lcc_threshold: float = 0.5) -> Dict[str, float]:
+    """
+    Reduces the metric curves of one attack to scalars: R-index, critical removal fraction
+    and, when the curve is present, the area under the algebraic connectivity curve over
+    the removed fraction.
+    """
+    lcc = results['lcc']
+    summary = {
+        'r_index': r_index(lcc),
+        'critical_fraction': critical_fraction(lcc, lcc_threshold),
+    }
+    if 'algebraic_connectivity' in results:
+        ac = np.asarray(results['algebraic_connectivity'], dtype=float)
+        n = len(ac) - 1
+        summary['ac_auc'] = float(np.trapezoid(ac, dx=1.0 / n)) if n > 0 else 0.0
+    return summary
@@ -12,14 +12,32 @@ def models():
     }
 
 STATIC_SIMULATION_CONFIG = {
+    # Root seed: every (model, strategy, run) derives its own random stream from it
+    'seed': 42,
     'num_nodes': 200,
     'num_runs_per_setting': 100,
     'models': models(),
     'strategies': ['random', 'targeted_degree', 'targeted_centrality'],
-    'results_filename': 'static_analysis_200n_100r.csv'
+    'results_filename': 'static_analysis_200n_100r.csv',
+    # Per-run robustness summary: R-index, critical fraction (first removed fraction with
+    # LCC < critical_lcc_threshold) and area under the algebraic connectivity curve
+    'summary_filename': 'static_summary_200n_100r.csv',
+    'critical_lcc_threshold': 0.5,
+    # Adaptive run counts: keep adding runs per (model, strategy) until the CI of
+    # each metric's per-run mean is narrower than target_ci_width (or max_runs is hit)
+    'convergence': {
+        'enabled': False,
+        'metrics': ['lcc'],
+        'target_ci_width': 0.01,
+        'confidence': 0.95,
+        'min_runs': 2,
+        'max_runs': 100,
+    },
 }
 
 DYNAMIC_SIMULATION_CONFIG = {
+    # Root seed: every (model, run) derives its own random stream from it
+    'seed': 42,
     'num_nodes': 200,
     'num_runs_per_setting': 20,
     'models': models(),
@@ -35,6 +53,40 @@ DYNAMIC_SIMULATION_CONFIG = {
     'link_flip_prob': 0.0,
     'link_down_steps': 10,
     'ttr_epsilon': 0.02,
+    # Traffic: 'uniform' sends between random node pairs, 'sink' sends from sensors to the
+    # nearest sink ('traffic_target': 'sink') or nearest sink/gateway ('gateway')
+    'traffic_model': 'uniform',
+    'traffic_target': 'sink',
+    # Links: 'flat' flips every edge with link_flip_prob; 'spatial' (models with node positions)
+    # scales that base probability by link length and the number of interferers near the link
+    'link_model': 'flat',
+    'spatial_links': {
+        'path_loss_exponent': 2.0,
+        'range_factor': 4.0,
+        'interference_range': 2.0,   # in multiples of the communication radius
+        'interference_factor': 1.0,
+        'mobility_fraction': 0.0,    # fraction of nodes moving per step
+        'mobility_step': 0.01,
+    },
+    # Graph kernel for uniform-traffic routing and the per-step LCC: 'networkx' or 'sparse'
+    # (vectorized NumPy/SciPy BFS and components on a CSR adjacency with alive masks)
+    'kernel': 'networkx',
+    # Motter-Lai overload cascades: cascade_num_flows routed flows define each node's relay load;
+    # a node fails once its load exceeds (1 + cascade_alpha) times its initial load
+    'cascade_enabled': False,
+    'cascade_alpha': 0.2,
+    'cascade_num_flows': 200,
+    # Adaptive run counts per model, driven by the per-run summary metrics
+    'convergence': {
+        'enabled': False,
+        'metrics': ['ddr_final'],
+        'target_ci_width': 0.01,
+        'confidence': 0.95,
+        'min_runs': 2,
+        'max_runs': 50,
+    },
+    # Event logs (--event-log): a state snapshot every N steps bounds the replay seek cost
+    'event_log_snapshot_interval': 100,
     # Outputs
     'timeseries_filename': 'dynamic_timeseries.csv',
     'summary_filename': 'dynamic_summary.csv',
@@ -0,0 +1 @@
+"""Unified command line entry point: python -m iotrobust <command> [options]."""
@@ -0,0 +1,47 @@
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+from iotrobust.cli import COMMANDS
+
+# Median cold start per command, measured with `--help` so no simulation work is included
+DEFAULT_BUDGET_MS = 150.0
+
+
+def measure_cold_start(cmd: List[str], repeats: int) -> float:
+    """Median wall-clock milliseconds of `repeats` fresh interpreter runs of cmd."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        timings.append((time.perf_counter() - start) * 1000.0)
+    return statistics.median(timings)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Measure the cold-start time of each CLI command against a budget.")
+    parser.add_argument('--repeats', type=int, default=5, help='Fresh interpreter runs per command.')
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS,
+                        help=f'Median start-up budget per command (default: {DEFAULT_BUDGET_MS:.0f} ms).')
+    args = parser.parse_args(argv)
+
+    # Baseline: the interpreter itself, which no amount of lazy importing can remove
+    baseline = measure_cold_start([sys.executable, '-c', 'pass'], args.repeats)
+    print(f"{'python -c pass':<28} {baseline:8.1f} ms")
+
+    results: Dict[str, float] = {}
+    for command in ['--help'] + [c for c in COMMANDS if c != 'bench']:
+        cmd_args = [command] if command == '--help' else [command, '--help']
+        results[command] = measure_cold_start([sys.executable, '-m', 'iotrobust', *cmd_args], args.repeats)
+        status = 'ok' if results[command] <= args.budget_ms else 'OVER BUDGET'
+        print(f"{'iotrobust ' + ' '.join(cmd_args):<28} {results[command]:8.1f} ms  {status}")
+
+    over = [c for c, ms in results.items() if ms > args.budget_ms]
+    if over:
+        print(f"\n{len(over)} command(s) exceed the {args.budget_ms:.0f} ms start-up budget")
+        sys.exit(1)
+    print(f"\nAll commands start within the {args.budget_ms:.0f} ms budget")
+
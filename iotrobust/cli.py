@@ -0,0 +1,48 @@
+import argparse
+import importlib
+import sys
+from typing import List, Optional
+
+# command -> (module, function, help). Modules are imported only when their command runs,
+# so `python -m iotrobust --help` never loads networkx, pandas, numpy or matplotlib.
+#
+# Lazy-import rule: a command module, and every module it imports at module level, imports the
+# heavy dependencies (numpy, scipy, networkx, pandas, matplotlib, tqdm and the analysis modules
+# that pull them in) inside the functions that use them, and only under TYPE_CHECKING for
+# annotations. `--help`, `--merge` and short-lived queue workers then start within the budget
+# that `iotrobust bench` checks.
+COMMANDS = {
+    'static': ('simulation.static_simulation', 'main', 'Run static attack simulations.'),
+    'dynamic': ('simulation.dynamic_simulation', 'main', 'Run dynamic network simulations.'),
+    'plot': ('plots.plot_results', 'main', 'Plot static simulation results.'),
+    'visualize': ('models.model_visualizations.visualize_models', 'main', 'Render the configured network models.'),
+    'replay': ('models.model_visualizations.replay', 'main', 'Replay a dynamic simulation event log.'),
+    'bench': ('iotrobust.bench', 'main', 'Measure the cold-start time of the CLI commands.'),
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='python -m iotrobust',
+        description="IoT network robustness simulations.",
+        epilog="Run 'python -m iotrobust <command> --help' for the options of a command.",
+    )
+    subparsers = parser.add_subparsers(dest='command', metavar='<command>', required=True)
+    for name, (_, _, help_text) in COMMANDS.items():
+        # Options are parsed by the command's own main(); only its name is parsed here
+        subparsers.add_parser(name, help=help_text, add_help=False)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None):
+    argv = sys.argv[1:] if argv is None else argv
+    parser = build_parser()
+    if not argv or argv[0] not in COMMANDS:
+        parser.parse_args(argv)  # prints usage / help and exits
+        return
+
+    command, rest = argv[0], argv[1:]
+    module_name, func_name, _ = COMMANDS[command]
+    sys.argv[0] = f"python -m iotrobust {command}"  # argparse prog of the sub-command
+    func = getattr(importlib.import_module(module_name), func_name)
+    return func(rest)
@@ -1,26 +1,28 @@
 import networkx as nx
 import math
 
-def generate_network(model_type, num_nodes, **params):
+def generate_network(model_type, num_nodes, seed=None, **params):
     """
     Generate a network based on the specified model type.
+    seed is passed to the networkx generators (int, random.Random or numpy Generator);
+    the hierarchical model is deterministic.
     """
     if model_type == 'ER':
         p = params.get('p', math.log(num_nodes) / num_nodes)
-        return nx.erdos_renyi_graph(num_nodes, p)
+        return nx.erdos_renyi_graph(num_nodes, p, seed=seed)
 
     elif model_type == 'BA':
         m = params.get('m', 3)
-        return nx.barabasi_albert_graph(num_nodes, m)
+        return nx.barabasi_albert_graph(num_nodes, m, seed=seed)
 
     elif model_type == 'WS':
         k = params.get('k', 6)
         p = params.get('p', 0.1)
-        return nx.watts_strogatz_graph(num_nodes, k, p)
+        return nx.watts_strogatz_graph(num_nodes, k, p, seed=seed)
 
     elif model_type == 'RGG':
         radius = params.get('radius', 0.075)
-        return nx.random_geometric_graph(num_nodes, radius)
+        return nx.random_geometric_graph(num_nodes, radius, seed=seed)
 
     elif model_type == 'HIER':
         num_gateways = params.get('num_gateways', 10)
@@ -1,10 +1,28 @@
 import os
+import networkx as nx
 from pyvis.network import Network
 
 from config import STATIC_SIMULATION_CONFIG
 from models.model_generator import generate_network
+from models.model_visualizations.large_scale import scaled_model_params
+from simulation.seeding import DEFAULT_SEED, task_rng
 
-def visualize_interactively():
+def _sample_subgraph(G, max_nodes):
+    """
+    Keeps the HTML size bounded: graphs above max_nodes are cut down to the BFS ball of
+    max_nodes nodes around the highest-degree node, which preserves local structure.
+    """
+    if max_nodes is None or G.number_of_nodes() <= max_nodes:
+        return G
+    hub = max(G.nodes(), key=G.degree)
+    kept = []
+    for node in nx.bfs_tree(G, hub):
+        kept.append(node)
+        if len(kept) >= max_nodes:
+            break
+    return G.subgraph(kept).copy()
+
+def visualize_interactively(num_nodes=None, max_nodes=2000):
     """
     Generates an interactive HTML visualization for each network model
     and saves it to a file.
@@ -17,14 +35,19 @@ def visualize_interactively():
         os.makedirs(output_dir)
         print(f"Created directory: '{output_dir}'")
 
-    num_nodes = STATIC_SIMULATION_CONFIG['num_nodes']
+    base_nodes = STATIC_SIMULATION_CONFIG['num_nodes']
+    num_nodes = num_nodes or base_nodes
 
     for model_name, model_params in STATIC_SIMULATION_CONFIG['models'].items():
         print(f"Generating interactive plot for {model_name}...")
 
         # 1. Generate the networkx graph
         # Note: We use 'num_nodes' to match the function definition
-        G = generate_network(num_nodes=num_nodes, **model_params)
+        rng = task_rng(STATIC_SIMULATION_CONFIG.get('seed', DEFAULT_SEED), model_name, None, 0)
+        G = generate_network(num_nodes=num_nodes, seed=rng, **scaled_model_params(model_params, num_nodes, base_nodes))
+        if G.number_of_nodes() > max_nodes:
+            print(f"  {G.number_of_nodes()} nodes exceed the HTML cap, showing a {max_nodes}-node neighbourhood")
+            G = _sample_subgraph(G, max_nodes)
 
         # 2. Create a Pyvis network object
         # The 'notebook=True' argument is useful for generating standalone HTML files
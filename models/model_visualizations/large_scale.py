@@ -0,0 +1,222 @@
+import hashlib
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+import scipy.sparse as sp
+
+# -----------------------
+# Fast layouts
+# -----------------------
+
+def spectral_layout_sparse(G: nx.Graph, iterations: int = 300, seed: int = 42) -> np.ndarray:
+    """
+    Degree-normalized spectral layout (Koren) computed by power iteration on the sparse
+    adjacency: x <- (I + D^-1 A) / 2 x, D-orthogonalized against the trivial eigenvector.
+    Cost is O(iterations * edges), and unlike an eigensolver it degrades gracefully on
+    disconnected graphs. Returns an (n, 2) array in the order of G.nodes().
+    """
+    n = G.number_of_nodes()
+    if n <= 2:
+        return np.zeros((n, 2)) if n == 0 else np.column_stack([np.arange(n, dtype=float), np.zeros(n)])
+
+    A = nx.to_scipy_sparse_array(G, format='csr', dtype=float)
+    deg = np.asarray(A.sum(axis=1)).ravel()
+    deg[deg == 0] = 1.0  # isolated nodes stay at their (random) start position
+    walk = sp.diags(1.0 / deg) @ A
+
+    rng = np.random.default_rng(seed)
+    ones = np.ones(n) / np.sqrt(deg.sum())
+    coords = []
+    for _ in range(2):
+        x = rng.random(n) - 0.5
+        for _ in range(iterations):
+            # D-orthogonalize against the constant vector and the already computed axes
+            for u in [ones] + coords:
+                x -= (x @ (deg * u)) / (u @ (deg * u)) * u
+            x = 0.5 * (x + walk @ x)
+            x /= np.linalg.norm(x) or 1.0
+        coords.append(x)
+    return _normalize(np.column_stack(coords))
+
+
+def _normalize(pos: np.ndarray) -> np.ndarray:
+    pos = pos - pos.mean(axis=0)
+    scale = np.abs(pos).max()
+    return pos / scale if scale > 0 else pos
+
+
+def fast_layout(G: nx.Graph, model_type: str) -> np.ndarray:
+    """Picks the cheapest faithful layout per model, as an (n, 2) array in G.nodes() order."""
+    if model_type == 'RGG':
+        return np.array([G.nodes[n]['pos'] for n in G.nodes()], dtype=float)
+    if model_type == 'HIER':
+        from models.model_visualizations.visualize_models import _generate_hierarchical_layout
+        pos = _generate_hierarchical_layout(G)
+        return np.array([pos[n] for n in G.nodes()], dtype=float)
+    return spectral_layout_sparse(G)
+
+# -----------------------
+# Layout cache
+# -----------------------
+
+def topology_key(G: nx.Graph, model_type: str) -> str:
+    """Content hash of the topology (nodes + edges) and layout kind."""
+    nodes = np.fromiter(G.nodes(), dtype=np.int64, count=G.number_of_nodes())
+    edges = np.array(list(G.edges()), dtype=np.int64).reshape(-1, 2)
+    edges.sort(axis=1)
+    edges = edges[np.lexsort((edges[:, 1], edges[:, 0]))]
+    h = hashlib.sha1(model_type.encode())
+    h.update(np.sort(nodes).tobytes())
+    h.update(edges.tobytes())
+    return h.hexdigest()[:16]
+
+
+def cached_layout(G: nx.Graph, model_type: str, cache_dir: Optional[str]) -> np.ndarray:
+    """Returns the layout from cache_dir when this exact topology was laid out before."""
+    if not cache_dir:
+        return fast_layout(G, model_type)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, f"{model_type}_{topology_key(G, model_type)}.npz")
+    nodes = np.fromiter(G.nodes(), dtype=np.int64, count=G.number_of_nodes())
+    if os.path.exists(path):
+        cached = np.load(path)
+        # Cached positions are stored by node id; reorder to the current node order
+        index = {int(n): i for i, n in enumerate(cached['nodes'])}
+        return cached['pos'][[index[int(n)] for n in nodes]]
+
+    pos = fast_layout(G, model_type)
+    np.savez_compressed(path, nodes=nodes, pos=pos)
+    return pos
+
+# -----------------------
+# Rasterized rendering
+# -----------------------
+
+def sample_edges(edges: np.ndarray, max_edges: Optional[int], seed: int = 42) -> np.ndarray:
+    """Uniformly samples at most max_edges edges; drawing more adds ink, not information."""
+    if max_edges is None or len(edges) <= max_edges:
+        return edges
+    rng = np.random.default_rng(seed)
+    return edges[rng.choice(len(edges), size=max_edges, replace=False)]
+
+
+def edge_density_image(
+        pos: np.ndarray,
+        edges: np.ndarray,
+        extent: Tuple[float, float, float, float],
+        resolution: int = 2000,
+        max_samples_per_edge: int = 256,
+) -> np.ndarray:
+    """
+    Rasterizes edges into a (resolution x resolution) ink-density image by sampling points
+    along every segment (about one per pixel of its length) and counting them per pixel.
+    Agg draws each line as its own anti-aliased path, which takes tens of seconds for 10^5
+    long edges; this is a handful of vectorized NumPy passes.
+    """
+    x0, x1, y0, y1 = extent
+    scale = np.array([(resolution - 1) / max(x1 - x0, 1e-12), (resolution - 1) / max(y1 - y0, 1e-12)])
+    p = (pos - np.array([x0, y0])) * scale  # pixel coordinates
+    image = np.zeros(resolution * resolution, dtype=np.float64)
+    if len(edges) == 0:
+        return image.reshape(resolution, resolution)
+
+    a, b = p[edges[:, 0]], p[edges[:, 1]]
+    lengths = np.ceil(np.abs(b - a).max(axis=1)).astype(np.int64)
+    samples = np.clip(lengths, 1, max_samples_per_edge)
+    # Process edges grouped by sample count so each group is one dense array
+    for k in np.unique(samples):
+        sel = samples == k
+        t = np.linspace(0.0, 1.0, k + 1)
+        pts = a[sel, None, :] + (b[sel] - a[sel])[:, None, :] * t[None, :, None]
+        ij = np.rint(pts.reshape(-1, 2)).astype(np.int64)
+        np.clip(ij, 0, resolution - 1, out=ij)
+        # Weight by 1/samples so every edge deposits the same total ink regardless of length
+        np.add.at(image, ij[:, 1] * resolution + ij[:, 0], 1.0 / (k + 1))
+    return image.reshape(resolution, resolution)
+
+
+def node_groups(G: nx.Graph, model_type: str) -> List[Tuple[np.ndarray, float, str]]:
+    """
+    Node styles matching the small-graph pictures, scaled down for large graphs, as
+    (node mask, marker size, color) groups. One uniform scatter per group lets Agg stamp a
+    single cached marker instead of building a path per node.
+    """
+    n = max(G.number_of_nodes(), 1)
+    base = float(np.clip(20000.0 / n, 0.2, 50.0))
+    if model_type == 'HIER':
+        levels = np.fromiter((G.nodes[v].get('level', 2) for v in G.nodes()), dtype=np.int64, count=G.number_of_nodes())
+        styles = {0: (40 * base, 'red'), 1: (8 * base, 'orange'), 2: (base, 'skyblue')}
+        return [(levels == lv, size, color) for lv, (size, color) in styles.items()]
+    if model_type == 'BA':
+        # Size by degree, quantized into log2 bins
+        degrees = np.fromiter((d for _, d in G.degree()), dtype=float, count=G.number_of_nodes())
+        bins = np.floor(np.log2(np.maximum(degrees, 1.0))).astype(np.int64)
+        scale = max(degrees.mean(), 1.0)
+        return [(bins == b, base * 2.0 ** b / scale, "#FF5733") for b in np.unique(bins)]
+    color = "#00B4D8" if model_type == 'RGG' else "#33A1FF"
+    return [(np.ones(G.number_of_nodes(), dtype=bool), base, color)]
+
+
+def render_large(
+        G: nx.Graph,
+        model_type: str,
+        output_path: str,
+        title: str,
+        cache_dir: Optional[str] = None,
+        max_edges: Optional[int] = 200_000,
+        dpi: int = 200,
+):
+    """
+    Renders a graph with a fast (cached) layout into a rasterized PNG. Edges are drawn as a
+    density image and nodes as one uniform scatter per style group, so drawing cost is linear.
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    from matplotlib.colors import LogNorm
+
+    pos = cached_layout(G, model_type, cache_dir)
+    index = {n: i for i, n in enumerate(G.nodes())}
+    edges = np.array([(index[u], index[v]) for u, v in G.edges()], dtype=np.int64).reshape(-1, 2)
+    edges = sample_edges(edges, max_edges)
+
+    fig, ax = plt.subplots(figsize=(12, 12))
+    fig.subplots_adjust(left=0.02, right=0.98, bottom=0.02, top=0.95)  # fixed margins: no second 'tight' draw pass
+    pad = 0.02 * max(np.ptp(pos[:, 0]), np.ptp(pos[:, 1]), 1e-12)
+    extent = (pos[:, 0].min() - pad, pos[:, 0].max() + pad, pos[:, 1].min() - pad, pos[:, 1].max() + pad)
+    density = edge_density_image(pos, edges, extent)
+    masked = np.ma.masked_less_equal(density, 0.0)
+    if masked.count():
+        ax.imshow(masked, origin='lower', extent=extent, cmap='Greys', aspect='auto', interpolation='nearest',
+                  # vmin below the sparsest pixel so lone edges stay visible instead of mapping to white
+                  norm=LogNorm(vmin=masked.min() / 4, vmax=max(masked.max(), masked.min() * 10)), alpha=0.6)
+    for mask, size, color in node_groups(G, model_type):
+        ax.scatter(pos[mask, 0], pos[mask, 1], s=size, c=color, alpha=0.9, linewidths=0, rasterized=True)
+    ax.set_xlim(extent[0], extent[1])
+    ax.set_ylim(extent[2], extent[3])
+    ax.set_title(title, fontsize=16)
+    ax.axis('off')
+
+    fig.savefig(output_path, dpi=dpi)
+    plt.close(fig)
+
+
+def scaled_model_params(model_params: Dict[str, Any], num_nodes: int, base_nodes: int) -> Dict[str, Any]:
+    """
+    Adapts configured model parameters from base_nodes to num_nodes nodes while keeping the
+    topology comparable: HIER ignores num_nodes, so sensors_per_gateway is derived from it, and
+    the RGG radius shrinks with sqrt(base_nodes / num_nodes) to keep the mean degree constant.
+    Without an override (num_nodes == base_nodes) the configured parameters are used as they are.
+    """
+    params = dict(model_params)
+    if num_nodes == base_nodes:
+        return params
+    if params.get('model_type') == 'HIER':
+        num_gateways = params.get('num_gateways', 10)
+        params['sensors_per_gateway'] = max(1, (num_nodes - 1 - num_gateways) // num_gateways)
+    elif params.get('model_type') == 'RGG' and 'radius' in params:
+        params['radius'] = params['radius'] * float(np.sqrt(base_nodes / num_nodes))
+    return params
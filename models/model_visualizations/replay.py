@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import argparse
+import os
+from typing import TYPE_CHECKING, List, Optional
+
+# Deferred imports (see iotrobust/cli.py): numpy, analysis.event_log, large_scale
+if TYPE_CHECKING:
+    from analysis.event_log import EventLog, NetworkState
+
+# Above this many edges the frame uses the rasterized density image instead of line segments
+MAX_VECTOR_EDGES = 20_000
+
+STATE_COLORS = {'online': "#33A1FF", 'offline': "orange", 'dead': "black"}
+
+
+class ReplayRenderer:
+    """Draws the network state of an event log frame by frame on a fixed layout."""
+
+    def __init__(self, log: EventLog):
+        import numpy as np
+        from models.model_visualizations.large_scale import fast_layout
+
+        self.log = log
+        G = log.graph()
+        model_type = 'RGG' if log.pos is not None else 'HIER' if log.level is not None else 'spectral'
+        self.pos = fast_layout(G, model_type)
+        self.nodes = np.fromiter(G.nodes(), dtype=np.int64, count=G.number_of_nodes())
+        index = {int(n): i for i, n in enumerate(self.nodes)}
+        self.edge_keys = [(int(u), int(v)) for u, v in log.edges]
+        self.edges = np.array([(index[u], index[v]) for u, v in self.edge_keys], dtype=np.int64).reshape(-1, 2)
+        self.index = index
+        pad = 0.02 * max(np.ptp(self.pos[:, 0]), np.ptp(self.pos[:, 1]), 1e-12) if len(self.pos) else 1.0
+        self.extent = (self.pos[:, 0].min() - pad, self.pos[:, 0].max() + pad,
+                       self.pos[:, 1].min() - pad, self.pos[:, 1].max() + pad) if len(self.pos) else (0, 1, 0, 1)
+
+    def draw(self, ax, step: int, state: NetworkState):
+        import numpy as np
+        from matplotlib.collections import LineCollection
+        from models.model_visualizations.large_scale import edge_density_image
+
+        ax.clear()
+        offline = np.zeros(len(self.nodes), dtype=bool)
+        dead = np.zeros(len(self.nodes), dtype=bool)
+        offline[[self.index[n] for n in state.offline]] = True
+        dead[[self.index[n] for n in state.dead]] = True
+
+        up = ~(offline[self.edges[:, 0]] | offline[self.edges[:, 1]]) if len(self.edges) else np.zeros(0, dtype=bool)
+        gone = state.down_edges | state.removed_edges
+        if gone:
+            down = np.fromiter((k in gone for k in self.edge_keys), dtype=bool, count=len(self.edge_keys))
+            up &= ~down
+        live_edges = self.edges[up]
+        if state.added_edges:
+            # Links created by node movement; drawn between the initial positions (movement is not logged)
+            added = np.array([(self.index[u], self.index[v]) for u, v in state.added_edges
+                              if (u, v) not in state.down_edges], dtype=np.int64).reshape(-1, 2)
+            added = added[~(offline[added[:, 0]] | offline[added[:, 1]])]
+            live_edges = np.concatenate([live_edges, added])
+
+        if len(live_edges) <= MAX_VECTOR_EDGES:
+            ax.add_collection(LineCollection(self.pos[live_edges], linewidths=0.5, colors='gray', alpha=0.5))
+        else:
+            density = edge_density_image(self.pos, live_edges, self.extent, resolution=1000)
+            ax.imshow(np.ma.masked_less_equal(density, 0.0), origin='lower', extent=self.extent,
+                      cmap='Greys', aspect='auto', interpolation='nearest', alpha=0.6)
+
+        size = float(np.clip(20000.0 / max(len(self.nodes), 1), 0.2, 30.0))
+        groups = {'online': ~offline, 'offline': offline & ~dead, 'dead': dead}
+        for name, mask in groups.items():
+            ax.scatter(self.pos[mask, 0], self.pos[mask, 1], s=size, c=STATE_COLORS[name],
+                       linewidths=0, label=f"{name} ({int(mask.sum())})")
+        ax.set_xlim(self.extent[0], self.extent[1])
+        ax.set_ylim(self.extent[2], self.extent[3])
+        ax.set_title(f"Step {step}: {len(state.down_edges)} links down", fontsize=14)
+        ax.legend(loc='upper right', markerscale=3)
+        ax.axis('off')
+
+
+def render_replay(log_path: str, output: str, start: int = 0, stop: Optional[int] = None, every: int = 10, fps: int = 5):
+    """
+    Renders steps start..stop of an event log. A '.gif' output is written as an animation,
+    anything else is treated as a directory of PNG frames.
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    from analysis.event_log import EventLog
+
+    log = EventLog(log_path)
+    stop = log.last_step if stop is None else min(stop, log.last_step)
+    renderer = ReplayRenderer(log)
+    fig, ax = plt.subplots(figsize=(10, 10))
+
+    frames = log.replay(start, stop, every)
+    if output.endswith('.gif'):
+        from matplotlib.animation import PillowWriter
+        writer = PillowWriter(fps=fps)
+        with writer.saving(fig, output, dpi=100):
+            for step, state in frames:
+                renderer.draw(ax, step, state)
+                writer.grab_frame()
+    else:
+        os.makedirs(output, exist_ok=True)
+        for step, state in frames:
+            renderer.draw(ax, step, state)
+            fig.savefig(os.path.join(output, f"step_{step:06d}.png"), dpi=100)
+    plt.close(fig)
+    print(f"Replay of '{log_path}' (steps {start}-{stop}, every {every}) written to '{output}'")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Replay a dynamic simulation event log as animated frames.")
+    parser.add_argument('log', type=str, help='Event log written with dynamic_simulation --event-log.')
+    parser.add_argument('-o', '--output', type=str, default='replay.gif', help="Output .gif or a directory for PNG frames.")
+    parser.add_argument('--start', type=int, default=0, help='First step to render.')
+    parser.add_argument('--stop', type=int, default=None, help='Last step to render (default: end of the log).')
+    parser.add_argument('--every', type=int, default=10, help='Render every N-th step.')
+    parser.add_argument('--fps', type=int, default=5, help='Frames per second of the GIF.')
+    parser.add_argument('--summary', action='store_true', help='Only print event counts and the state at --stop.')
+    args = parser.parse_args(argv)
+
+    if args.summary:
+        from analysis.event_log import EventLog
+
+        log = EventLog(args.log)
+        step = log.last_step if args.stop is None else args.stop
+        state = log.state_at(step)
+        print(f"Events: {log.event_counts()}")
+        print(f"State at step {step}: {len(state.offline)} offline ({len(state.dead)} dead), "
+              f"{len(state.down_edges)} links down")
+        return
+
+    render_replay(args.log, args.output, args.start, args.stop, args.every, args.fps)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,15 +1,15 @@
-import networkx as nx
-import matplotlib.pyplot as plt
+import argparse
 import os
-import numpy as np
+from typing import List, Optional
 
-from config import STATIC_SIMULATION_CONFIG
-from models.model_generator import generate_network
+# Deferred imports (see iotrobust/cli.py): networkx, numpy, matplotlib
 
 def _generate_hierarchical_layout(G):
     """
     Creates a custom layout for the hierarchical graph to display layers clearly.
     """
+    import numpy as np
+
     pos = {}
     nodes_by_level = {0: [], 1: [], 2: []}
     for n, data in G.nodes(data=True):
@@ -37,6 +37,12 @@ def visualize_and_save_models():
     Generates, visualizes, and saves an image of each network model
     defined in the configuration file with model-specific layouts.
     """
+    import networkx as nx
+    import matplotlib.pyplot as plt
+
+    from config import STATIC_SIMULATION_CONFIG
+    from models.model_generator import generate_network
+
     print("Starting model visualization...")
 
     output_dir = "models/model_visualizations/pictures"
@@ -94,5 +100,59 @@ def visualize_and_save_models():
 
     print(f"\nVisualizations saved successfully in the '{output_dir}' folder.")
 
+def visualize_large_models(num_nodes=None, model_names=None, cache_dir=None, max_edges=200_000):
+    """
+    Renders the configured models with fast layouts and rasterized output. Suitable for
+    topologies with 10^4-10^5 nodes, where spring layouts and vector output become unusable.
+    """
+    from config import STATIC_SIMULATION_CONFIG
+    from models.model_generator import generate_network
+    from models.model_visualizations.large_scale import render_large, scaled_model_params
+    from simulation.seeding import DEFAULT_SEED, task_rng
+
+    output_dir = "models/model_visualizations/pictures"
+    os.makedirs(output_dir, exist_ok=True)
+    base_nodes = STATIC_SIMULATION_CONFIG['num_nodes']
+    num_nodes = num_nodes or base_nodes
+
+    for model_name, model_params in STATIC_SIMULATION_CONFIG['models'].items():
+        if model_names and model_name not in model_names:
+            continue
+        print(f"Generating large-scale visualization for {model_name} (N={num_nodes})...")
+        params = scaled_model_params(model_params, num_nodes, base_nodes)
+        # Seeded, so repeated renders draw the same topology and reuse its cached layout
+        rng = task_rng(STATIC_SIMULATION_CONFIG.get('seed', DEFAULT_SEED), model_name, None, 0)
+        G = generate_network(num_nodes=num_nodes, seed=rng, **params)
+
+        filename = os.path.join(output_dir, f"{model_name.replace(' ', '_')}_model_{G.number_of_nodes()}n.png")
+        render_large(
+            G,
+            params['model_type'],
+            filename,
+            title=f"{model_name} Topology (N={G.number_of_nodes()})",
+            cache_dir=cache_dir,
+            max_edges=max_edges,
+        )
+        print(f"Saved '{filename}'")
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Generate pictures (or interactive HTML) of the configured network models.")
+    parser.add_argument('--interactive', action='store_true', help='Generate interactive pyvis HTML files instead of pictures.')
+    parser.add_argument('--fast', action='store_true', help='Use fast layouts and rasterized output for large topologies.')
+    parser.add_argument('--nodes', type=int, default=None, help='Override the number of nodes (with --fast or --interactive).')
+    parser.add_argument('--model', action='append', default=None, help='Only render this model (repeatable).')
+    parser.add_argument('--max-edges', type=int, default=200_000, help='Maximum number of (sampled) edges drawn with --fast.')
+    parser.add_argument('--max-html-nodes', type=int, default=2000, help='Node cap for --interactive; larger graphs are sampled.')
+    parser.add_argument('--cache-dir', type=str, default='.layout_cache', help="Layout cache directory for --fast ('' disables).")
+    args = parser.parse_args(argv)
+
+    if args.interactive:
+        from models.model_visualizations.interactive_visualizer import visualize_interactively
+        visualize_interactively(num_nodes=args.nodes, max_nodes=args.max_html_nodes)
+    elif args.fast:
+        visualize_large_models(args.nodes, args.model, args.cache_dir or None, args.max_edges)
+    else:
+        visualize_and_save_models()
+
 if __name__ == '__main__':
-    visualize_and_save_models()
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -1,24 +1,35 @@
-import pandas as pd
-import matplotlib.pyplot as plt
+from __future__ import annotations
+
 import os
 import argparse
+from typing import TYPE_CHECKING, List, Optional
 
-from config import STATIC_SIMULATION_CONFIG
+# Deferred imports (see iotrobust/cli.py): pandas, matplotlib
+if TYPE_CHECKING:
+    import pandas as pd
 
 class ResultsPlotter:
     """Handles the visualization of simulation results from a DataFrame."""
 
-    def __init__(self, results_df: pd.DataFrame, metric_to_plot: str):
+    def __init__(self, results_df: Optional[pd.DataFrame], metric_to_plot: str, summary: Optional[pd.DataFrame] = None):
+        """Either the raw results or an already aggregated summary (e.g. from the result store)."""
         self.df = results_df
         self.metric = metric_to_plot
-        self.summary = results_df.groupby(
-            ['model_name', 'attack_strategy', 'nodes_removed_fraction']
-        )[self.metric].mean().reset_index()
+        if summary is None:
+            summary = results_df.groupby(
+                ['model_name', 'attack_strategy', 'nodes_removed_fraction']
+            )[self.metric].mean().reset_index()
+        self.summary = summary
 
     def plot_comparison(self, save_plot=False, output_filename="resilience_comparison.png"):
         """Creates a multi-plot figure for comparison."""
+        import matplotlib.pyplot as plt
+
         models = self.summary['model_name'].unique()
         n_models = len(models)
+        if n_models == 0:
+            print("Nothing to plot: no results match the selected filters.")
+            return
 
         plt.style.use('seaborn-v0_8-whitegrid')
         fig, axes = plt.subplots(1, n_models, figsize=(7 * n_models, 6), sharey=False)
@@ -62,7 +73,7 @@ class ResultsPlotter:
         else:
             plt.show()
 
-def main():
+def main(argv: Optional[List[str]] = None):
     """Main function to load results and generate plots."""
     parser = argparse.ArgumentParser(description="Plot network resilience simulation results.")
     parser.add_argument(
@@ -82,19 +93,43 @@ def main():
         default="lcc", # Default to plotting LCC
         help="The metric to plot from the results file (one of: 'lcc', 'algebraic_connectivity', 'smoothness')."
     )
-    args = parser.parse_args()
-
-    results_file = STATIC_SIMULATION_CONFIG['results_filename']
+    parser.add_argument('--results', type=str, default=None, help="Override the results CSV from config.py.")
+    parser.add_argument('--model', action='append', default=None, help="Only plot this model (repeatable).")
+    parser.add_argument('--strategy', action='append', default=None, help="Only plot this attack strategy (repeatable).")
+    parser.add_argument('--min-fraction', type=float, default=None, help="Lower bound of the removed fraction.")
+    parser.add_argument('--max-fraction', type=float, default=None, help="Upper bound of the removed fraction.")
+    parser.add_argument('--store', type=str, default=None,
+                        help="SQLite result store (default: next to the results CSV, with a .sqlite suffix).")
+    parser.add_argument('--no-cache', action='store_true', help="Read and aggregate the CSV directly, bypassing the store.")
+    args = parser.parse_args(argv)
+
+    from config import STATIC_SIMULATION_CONFIG
+    results_file = args.results or STATIC_SIMULATION_CONFIG['results_filename']
 
     if not os.path.exists(results_file):
         print(f"Error: Results file '{results_file}' not found.")
         print("Please run the simulation script first.")
         return
 
-    print(f"Loading results from '{results_file}'...")
-    results_dataframe = pd.read_csv(results_file)
+    from plots.result_store import ResultStore, default_store_path, summarize_frame
 
-    plotter = ResultsPlotter(results_dataframe, metric_to_plot=args.metric)
+    filters = dict(models=args.model, strategies=args.strategy, fraction_range=(args.min_fraction, args.max_fraction))
+    try:
+        if args.no_cache:
+            import pandas as pd
+
+            print(f"Loading results from '{results_file}'...")
+            summary = summarize_frame(pd.read_csv(results_file), args.metric, **filters)
+        else:
+            store_path = args.store or default_store_path(results_file)
+            with ResultStore(store_path) as store:
+                if store.ingest(results_file):
+                    print(f"Indexed '{results_file}' into '{store_path}'")
+                summary = store.summary(args.metric, **filters)
+    except ValueError as e:
+        parser.error(str(e))
+
+    plotter = ResultsPlotter(None, metric_to_plot=args.metric, summary=summary)
     print(f"Generating plots for metric: '{args.metric}'...")
 
     plotter.plot_comparison(save_plot=args.save, output_filename=args.output)
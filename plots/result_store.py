@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Columns identifying a row of the static results; every other numeric column is a metric
+KEY_COLUMNS = ['model_name', 'attack_strategy', 'run_id', 'nodes_removed_fraction']
+GROUP_COLUMNS = ['model_name', 'attack_strategy', 'nodes_removed_fraction']
+
+FractionRange = Tuple[Optional[float], Optional[float]]
+
+
+def default_store_path(results_file: str) -> str:
+    return os.path.splitext(results_file)[0] + '.sqlite'
+
+
+def file_fingerprint(path: str) -> str:
+    """Cheap change detector for the source CSV: resolved path, size and modification time."""
+    st = os.stat(path)
+    return f"{os.path.abspath(path)}:{st.st_size}:{st.st_mtime_ns}"
+
+# -----------------------
+# Filtering (shared by the store and the plain CSV path)
+# -----------------------
+
+def _where(models: Optional[Sequence[str]], strategies: Optional[Sequence[str]], fraction_range: Optional[FractionRange]):
+    clauses, args = [], []
+    if models:
+        clauses.append(f"model_name IN ({', '.join('?' * len(models))})")
+        args.extend(models)
+    if strategies:
+        clauses.append(f"attack_strategy IN ({', '.join('?' * len(strategies))})")
+        args.extend(strategies)
+    lo, hi = fraction_range or (None, None)
+    if lo is not None:
+        clauses.append("nodes_removed_fraction >= ?")
+        args.append(lo)
+    if hi is not None:
+        clauses.append("nodes_removed_fraction <= ?")
+        args.append(hi)
+    return (" AND ".join(clauses) or "1"), args
+
+
+def summarize_frame(
+        df: pd.DataFrame,
+        metric: str,
+        models: Optional[Sequence[str]] = None,
+        strategies: Optional[Sequence[str]] = None,
+        fraction_range: Optional[FractionRange] = None,
+) -> pd.DataFrame:
+    """Mean of metric per (model, strategy, fraction) computed directly from a results DataFrame."""
+    if metric not in df.columns or metric in KEY_COLUMNS:
+        raise ValueError(f"Unknown metric '{metric}'. Available: {', '.join(c for c in df.columns if c not in KEY_COLUMNS)}")
+    mask = df['model_name'].notna()
+    if models:
+        mask &= df['model_name'].isin(models)
+    if strategies:
+        mask &= df['attack_strategy'].isin(strategies)
+    lo, hi = fraction_range or (None, None)
+    if lo is not None:
+        mask &= df['nodes_removed_fraction'] >= lo
+    if hi is not None:
+        mask &= df['nodes_removed_fraction'] <= hi
+    return df[mask].groupby(GROUP_COLUMNS)[metric].mean().reset_index()
+
+# -----------------------
+# SQLite result store
+# -----------------------
+
+class ResultStore:
+    """
+    SQLite copy of a static results CSV, indexed on (model, strategy, fraction), plus a cache
+    of the per-metric mean curves. The CSV is ingested once per fingerprint (re-ingested when it
+    changes); each metric is aggregated once, after which plots and filtered queries read only
+    the cached rows they need.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def ingest(self, csv_path: str, chunksize: int = 200_000) -> bool:
+        """Loads csv_path unless the store already holds this exact file. Returns True if it (re)loaded."""
+        import pandas as pd
+
+        fingerprint = file_fingerprint(csv_path)
+        if self._meta('fingerprint') == fingerprint:
+            return False
+
+        with self.conn:
+            self.conn.execute("DROP TABLE IF EXISTS results")
+            self.conn.execute("DROP TABLE IF EXISTS summaries")
+            for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+                chunk.to_sql('results', self.conn, if_exists='append', index=False)
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_results_group "
+                "ON results (model_name, attack_strategy, nodes_removed_fraction)"
+            )
+            self.conn.execute(
+                "CREATE TABLE summaries (metric TEXT, model_name TEXT, attack_strategy TEXT, "
+                "nodes_removed_fraction REAL, value REAL)"
+            )
+            self.conn.execute(
+                "CREATE INDEX idx_summaries ON summaries (metric, model_name, attack_strategy, nodes_removed_fraction)"
+            )
+            self.conn.execute("CREATE TABLE IF NOT EXISTS cached_metrics (metric TEXT PRIMARY KEY)")
+            self.conn.execute("DELETE FROM cached_metrics")
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('fingerprint', ?)", (fingerprint,))
+        return True
+
+    def columns(self) -> List[str]:
+        return [row[1] for row in self.conn.execute("PRAGMA table_info(results)")]
+
+    def metrics(self) -> List[str]:
+        return [c for c in self.columns() if c not in KEY_COLUMNS]
+
+    def _check_metric(self, metric: str):
+        # Metric names are interpolated as SQL identifiers, so only known columns are accepted
+        available = self.metrics()
+        if metric not in available:
+            raise ValueError(f"Unknown metric '{metric}'. Available: {', '.join(available)}")
+
+    def _ensure_summary(self, metric: str):
+        if self.conn.execute("SELECT 1 FROM cached_metrics WHERE metric = ?", (metric,)).fetchone():
+            return
+        with self.conn:
+            self.conn.execute(
+                f'INSERT INTO summaries SELECT ?, model_name, attack_strategy, nodes_removed_fraction, AVG("{metric}") '
+                f'FROM results GROUP BY model_name, attack_strategy, nodes_removed_fraction',
+                (metric,),
+            )
+            self.conn.execute("INSERT INTO cached_metrics VALUES (?)", (metric,))
+
+    def summary(
+            self,
+            metric: str,
+            models: Optional[Sequence[str]] = None,
+            strategies: Optional[Sequence[str]] = None,
+            fraction_range: Optional[FractionRange] = None,
+    ) -> pd.DataFrame:
+        """Mean curve of metric per (model, strategy, fraction), same layout as summarize_frame."""
+        import pandas as pd
+
+        self._check_metric(metric)
+        self._ensure_summary(metric)
+        where, args = _where(models, strategies, fraction_range)
+        return pd.read_sql_query(
+            f"SELECT model_name, attack_strategy, nodes_removed_fraction, value AS \"{metric}\" FROM summaries "
+            f"WHERE metric = ? AND {where} ORDER BY model_name, attack_strategy, nodes_removed_fraction",
+            self.conn,
+            params=[metric] + args,
+        )
+
+    def rows(
+            self,
+            metrics: Optional[Sequence[str]] = None,
+            models: Optional[Sequence[str]] = None,
+            strategies: Optional[Sequence[str]] = None,
+            fraction_range: Optional[FractionRange] = None,
+    ) -> pd.DataFrame:
+        """Raw per-run rows (key columns plus the requested metrics) matching the filters."""
+        import pandas as pd
+
+        metrics = list(metrics) if metrics else self.metrics()
+        for metric in metrics:
+            self._check_metric(metric)
+        where, args = _where(models, strategies, fraction_range)
+        columns = ", ".join(f'"{c}"' for c in KEY_COLUMNS + metrics)
+        return pd.read_sql_query(f"SELECT {columns} FROM results WHERE {where}", self.conn, params=args)
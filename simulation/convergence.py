@@ -0,0 +1,96 @@
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+# -----------------------
+# Adaptive Monte Carlo run control
+# -----------------------
+
+@dataclass
+class ConvergenceCriteria:
+    metrics: List[str] = field(default_factory=lambda: ['lcc'])
+    target_ci_width: float = 0.01  # full width of the confidence interval
+    confidence: float = 0.95
+    min_runs: int = 2               # need at least two samples to estimate variance
+    max_runs: int = 100             # hard cap per setting
+
+
+def criteria_from_config(config: Optional[Dict[str, Any]]) -> Optional[ConvergenceCriteria]:
+    """
+    Builds the convergence criteria from a config section.
+    Returns None when adaptive run counts are disabled.
+    """
+    if not config or not config.get('enabled', False):
+        return None
+    criteria = ConvergenceCriteria(
+        metrics=list(config.get('metrics', ['lcc'])),
+        target_ci_width=config.get('target_ci_width', 0.01),
+        confidence=config.get('confidence', 0.95),
+        min_runs=config.get('min_runs', 2),
+        max_runs=config.get('max_runs', 100),
+    )
+    if criteria.min_runs < 1 or criteria.max_runs < criteria.min_runs:
+        raise ValueError("Convergence requires 1 <= min_runs <= max_runs")
+    return criteria
+
+
+def ci_width(values: List[float], confidence: float) -> float:
+    """
+    Full width of the Student-t confidence interval of the sample mean.
+    Fewer than two samples give an infinite width (no variance estimate); two or more
+    identical samples (e.g. a deterministic model/strategy) give a width of 0.
+    Any non-finite sample, e.g. a time_to_* metric of a run in which the event never
+    happened, also gives an infinite width: the mean is undefined, so such a setting keeps
+    adding runs up to max_runs rather than stopping on identical inf values.
+    """
+    if len(values) < 2 or not all(math.isfinite(v) for v in values):
+        return float('inf')
+    if all(v == values[0] for v in values):
+        return 0.0
+    # Imported lazily: scipy.stats dominates the start-up time of the CLI entry points
+    import numpy as np
+    from scipy import stats
+
+    arr = np.asarray(values, dtype=float)
+    sem = arr.std(ddof=1) / math.sqrt(len(arr))
+    t_crit = stats.t.ppf(0.5 + confidence / 2.0, df=len(arr) - 1)
+    return float(2.0 * t_crit * sem)
+
+
+class ConvergenceTracker:
+    """Collects one scalar per run and metric and decides when to stop adding runs."""
+
+    def __init__(self, criteria: ConvergenceCriteria):
+        self.criteria = criteria
+        self.samples: Dict[str, List[float]] = {m: [] for m in criteria.metrics}
+
+    @property
+    def runs(self) -> int:
+        return min((len(v) for v in self.samples.values()), default=0)
+
+    def add(self, values: Dict[str, float]):
+        for metric in self.criteria.metrics:
+            if metric not in values:
+                raise KeyError(f"Convergence metric '{metric}' is not produced by this simulation")
+            self.samples[metric].append(float(values[metric]))
+
+    def widths(self) -> Dict[str, float]:
+        return {m: ci_width(v, self.criteria.confidence) for m, v in self.samples.items()}
+
+    def converged(self) -> bool:
+        if self.runs < self.criteria.min_runs:
+            return False
+        return all(w <= self.criteria.target_ci_width for w in self.widths().values())
+
+    def should_continue(self) -> bool:
+        return self.runs < self.criteria.max_runs and not self.converged()
+
+
+def format_runs_report(runs_used: Dict[tuple, int], widths: Dict[tuple, Dict[str, float]]) -> str:
+    """Renders the number of runs actually used per setting as a small text table."""
+    lines = ["Runs used per setting:"]
+    for key, runs in runs_used.items():
+        label = " / ".join(str(k) for k in key)
+        ci = ", ".join(f"{m} CI={w:.4g}" for m, w in widths.get(key, {}).items())
+        lines.append(f"  {label}: {runs} runs ({ci})")
+    return "\n".join(lines)
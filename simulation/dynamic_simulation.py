@@ -1,18 +1,38 @@
+from __future__ import annotations
+
 import argparse
-from typing import Dict, Any
+import os
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple
+
+# Deferred imports (see iotrobust/cli.py): pandas, tqdm, networkx, analysis.*
+from simulation.convergence import ConvergenceTracker, criteria_from_config, format_runs_report
+from simulation.seeding import DEFAULT_SEED, fork, task_rng
+from simulation.sharding import (
+    WorkQueue,
+    append_csv,
+    default_worker_id,
+    enumerate_tasks,
+    merge_results,
+    missing_tasks,
+    parse_shard,
+    partial_outputs,
+    report_missing,
+    select_shard,
+    shard_path,
+    worker_path,
+)
 
-import pandas as pd
-from tqdm import tqdm
+if TYPE_CHECKING:
+    import pandas as pd
+    from analysis.dynamic_graph_models_analysis import DynamicParams
 
-from config import DYNAMIC_SIMULATION_CONFIG
-from models.model_generator import generate_network
-from analysis.dynamic_graph_models_analysis import (
-    DynamicParams,
-    simulate_dynamic,
-)
+TASK_COLUMNS = ['model_name', 'run_id']
 
 
 def build_params(config: Dict[str, Any], compute_ac: bool) -> DynamicParams:
+    from analysis.dynamic_graph_models_analysis import DynamicParams
+    from analysis.spatial_links import SpatialLinkParams
+
     return DynamicParams(
         steps=config.get('steps', 1000),
         packet_rate=config.get('packet_rate', 1),
@@ -26,53 +46,197 @@ def build_params(config: Dict[str, Any], compute_ac: bool) -> DynamicParams:
         link_down_steps=config.get('link_down_steps', 10),
         ttr_epsilon=config.get('ttr_epsilon', 0.02),
         compute_algebraic_connectivity=compute_ac,
+        traffic_model=config.get('traffic_model', 'uniform'),
+        traffic_target=config.get('traffic_target', 'sink'),
+        link_model=config.get('link_model', 'flat'),
+        spatial=SpatialLinkParams(**config.get('spatial_links', {})),
+        kernel=config.get('kernel', 'networkx'),
+        cascade_enabled=config.get('cascade_enabled', False),
+        cascade_alpha=config.get('cascade_alpha', 0.2),
+        cascade_num_flows=config.get('cascade_num_flows', 200),
     )
 
 
-def main():
+def event_log_path(event_log_dir: str, model_name: str, run_id: int) -> str:
+    return os.path.join(event_log_dir, f"{model_name.replace(' ', '_')}_run{run_id}.evlog")
+
+
+def run_task(
+        cfg: Dict[str, Any],
+        params: DynamicParams,
+        model_name: str,
+        run_id: int,
+        event_log_dir: Optional[str] = None,
+) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """Runs one (model, run) dynamic simulation and returns its time series and summary row."""
+    from models.model_generator import generate_network
+    from analysis.dynamic_graph_models_analysis import simulate_dynamic
+    from analysis.event_log import EventLogWriter
+
+    graph_rng, sim_rng = fork(task_rng(cfg.get('seed', DEFAULT_SEED), model_name, None, run_id), 2)
+
+    gen_params = cfg['models'][model_name].copy()
+    model_type = gen_params.pop('model_type')
+    G = generate_network(model_type=model_type, num_nodes=cfg['num_nodes'], seed=graph_rng, **gen_params)
+
+    if event_log_dir:
+        os.makedirs(event_log_dir, exist_ok=True)
+        with EventLogWriter(event_log_path(event_log_dir, model_name, run_id), G,
+                            snapshot_interval=cfg.get('event_log_snapshot_interval', 100)) as log:
+            df, summary = simulate_dynamic(G, params=params, event_log=log, rng=sim_rng)
+    else:
+        df, summary = simulate_dynamic(G, params=params, rng=sim_rng)
+
+    df['model_name'] = model_name
+    df['run_id'] = run_id
+
+    summary_row = {'model_name': model_name, 'run_id': run_id}
+    summary_row.update(summary)
+    return df, summary_row
+
+
+def merge_outputs(cfg: Dict[str, Any], timeseries_path: str, summary_path: str):
+    """Combines shard/worker outputs of both result files into single files ordered like a serial run."""
+    order = {'model_name': list(cfg['models'])}
+    expected = [(model_name, run_id) for model_name, _, run_id in enumerate_tasks(cfg['models'], [None], cfg['num_runs_per_setting'])]
+    for path in (timeseries_path, summary_path):
+        inputs = partial_outputs(path)
+        if not inputs:
+            raise FileNotFoundError(f"No shard/worker outputs found for '{path}'")
+        merged = merge_results(inputs, task_columns=TASK_COLUMNS, order=order)
+        merged.to_csv(path, index=False)
+        print(f"Merged {len(inputs)} partial result files into {path}")
+        report_missing(missing_tasks(merged, expected, TASK_COLUMNS), path)
+
+
+def main(argv: Optional[List[str]] = None):
     parser = argparse.ArgumentParser(description="Run dynamic network simulations and export results.")
     parser.add_argument('--runs', type=int, default=None, help='Override number of runs per model.')
     parser.add_argument('--steps', type=int, default=None, help='Override number of time steps.')
+    parser.add_argument('--adaptive', action='store_true', help='Add runs per model until the summary metrics converge.')
+    parser.add_argument('--traffic', choices=['uniform', 'sink'], default=None, help='Override the traffic model.')
+    parser.add_argument('--link-model', choices=['flat', 'spatial'], default=None,
+                        help="Override the link model ('spatial' applies to models with node positions, i.e. RGG).")
+    parser.add_argument('--kernel', choices=['networkx', 'sparse'], default=None,
+                        help='Override the graph kernel used for packet routing and LCC.')
+    parser.add_argument('--cascade', action='store_true', help='Enable overload cascades driven by relay load.')
+    parser.add_argument('--cascade-alpha', type=float, default=None, help='Override the cascade capacity tolerance alpha.')
     parser.add_argument('--compute-ac', action='store_true', help='Compute algebraic connectivity per step (slower).')
     parser.add_argument('--timeseries', type=str, default=None, help='Override timeseries output filename.')
     parser.add_argument('--summary', type=str, default=None, help='Override summary output filename.')
-    args = parser.parse_args()
-
+    parser.add_argument('--event-log', type=str, default=None, metavar='DIR',
+                        help='Write a binary event log per run into DIR (replay with models.model_visualizations.replay).')
+    parser.add_argument('--shard', type=str, default=None, help="Run only shard i of N of the task space ('i/N', 0-based).")
+    parser.add_argument('--queue', type=str, default=None, help='Pull tasks from a shared SQLite work queue at this path.')
+    parser.add_argument('--worker-id', type=str, default=None, help='Worker name used for the queue output files.')
+    parser.add_argument('--lease', type=float, default=None, metavar='SECONDS',
+                        help='Re-run queue tasks claimed more than SECONDS ago (left behind by crashed workers).')
+    parser.add_argument('--merge', action='store_true', help='Merge all shard/worker outputs of the configured files.')
+    args = parser.parse_args(argv)
+
+    from config import DYNAMIC_SIMULATION_CONFIG
     cfg = dict(DYNAMIC_SIMULATION_CONFIG)
 
     if args.runs is not None:
         cfg['num_runs_per_setting'] = args.runs
     if args.steps is not None:
         cfg['steps'] = args.steps
+    if args.traffic is not None:
+        cfg['traffic_model'] = args.traffic
+    if args.link_model is not None:
+        cfg['link_model'] = args.link_model
+    if args.kernel is not None:
+        cfg['kernel'] = args.kernel
+    if args.cascade:
+        cfg['cascade_enabled'] = True
+    if args.cascade_alpha is not None:
+        cfg['cascade_alpha'] = args.cascade_alpha
+    if args.adaptive:
+        cfg['convergence'] = dict(cfg.get('convergence') or {}, enabled=True)
 
     timeseries_path = args.timeseries or cfg.get('timeseries_filename', 'dynamic_timeseries.csv')
     summary_path = args.summary or cfg.get('summary_filename', 'dynamic_summary.csv')
 
-    params = build_params(cfg, compute_ac=args.compute_ac)
+    if args.merge:
+        try:
+            merge_outputs(cfg, timeseries_path, summary_path)
+        except FileNotFoundError as e:
+            parser.error(str(e))
+        return
 
-    ts_rows = []
-    summary_rows = []
-
-    total_runs = len(cfg['models']) * cfg['num_runs_per_setting']
-    with tqdm(total=total_runs, desc="Dynamic Simulations", unit="run") as pbar:
-        for model_name, model_params in cfg['models'].items():
-            for run_id in range(cfg['num_runs_per_setting']):
-                gen_params = model_params.copy()
-                model_type = gen_params.pop('model_type')
-                G = generate_network(model_type=model_type, num_nodes=cfg['num_nodes'], **gen_params)
+    import pandas as pd
+    from tqdm import tqdm
 
-                df, summary = simulate_dynamic(G, params=params, seed=42 + run_id)
+    params = build_params(cfg, compute_ac=args.compute_ac)
 
-                df['model_name'] = model_name
-                df['run_id'] = run_id
-                ts_rows.append(df)
+    criteria = criteria_from_config(cfg.get('convergence'))
+    if (args.shard or args.queue) and criteria:
+        parser.error("--shard/--queue need a fixed run count; do not combine them with adaptive runs")
+
+    tasks = enumerate_tasks(cfg['models'], [None], cfg['num_runs_per_setting'])
+
+    if args.queue:
+        worker_id = args.worker_id or default_worker_id()
+        ts_out = worker_path(timeseries_path, worker_id)
+        summary_out = worker_path(summary_path, worker_id)
+        queue = WorkQueue(args.queue, lease_seconds=args.lease)
+        completed = 0
+        try:
+            queue.populate(tasks)
+            with tqdm(desc=f"Worker {worker_id}", unit="run") as pbar:
+                while (task := queue.claim(worker_id)) is not None:
+                    model_name, _, run_id = task
+                    df, summary_row = run_task(cfg, params, model_name, run_id, args.event_log)
+                    append_csv(df, ts_out)
+                    append_csv(pd.DataFrame([summary_row]), summary_out)
+                    queue.complete(task)
+                    completed += 1
+                    pbar.update(1)
+        finally:
+            queue.close()
+        print(f"Worker '{worker_id}' completed {completed} tasks")
+        return
 
-                summary_row = {'model_name': model_name, 'run_id': run_id}
-                summary_row.update(summary)
-                summary_rows.append(summary_row)
+    ts_rows = []
+    summary_rows = []
 
-                pbar.set_postfix(model=model_name, run=run_id + 1)
-                pbar.update(1)
+    if args.shard:
+        index, count = parse_shard(args.shard)
+        shard_tasks = select_shard(tasks, index, count)
+        for model_name, _, run_id in tqdm(shard_tasks, desc="Dynamic Simulations", unit="run"):
+            df, summary_row = run_task(cfg, params, model_name, run_id, args.event_log)
+            ts_rows.append(df)
+            summary_rows.append(summary_row)
+        timeseries_path = shard_path(timeseries_path, index, count)
+        summary_path = shard_path(summary_path, index, count)
+    else:
+        runs_per_model = criteria.max_runs if criteria else cfg['num_runs_per_setting']
+        runs_used = {}
+        ci_widths = {}
+
+        total_runs = len(cfg['models']) * runs_per_model
+        with tqdm(total=total_runs, desc="Dynamic Simulations", unit="run") as pbar:
+            for model_name in cfg['models']:
+                tracker = ConvergenceTracker(criteria) if criteria else None
+                run_id = 0
+                while (tracker.should_continue() if tracker else run_id < runs_per_model):
+                    df, summary_row = run_task(cfg, params, model_name, run_id, args.event_log)
+                    ts_rows.append(df)
+                    summary_rows.append(summary_row)
+
+                    if tracker:
+                        tracker.add(summary_row)
+                    run_id += 1
+                    pbar.set_postfix(model=model_name, run=run_id)
+                    pbar.update(1)
+
+                runs_used[(model_name,)] = run_id
+                if tracker:
+                    ci_widths[(model_name,)] = tracker.widths()
+                    pbar.update(runs_per_model - run_id)
+
+        if criteria:
+            print(format_runs_report(runs_used, ci_widths))
 
     ts_df = pd.concat(ts_rows, ignore_index=True) if ts_rows else pd.DataFrame()
     summary_df = pd.DataFrame(summary_rows)
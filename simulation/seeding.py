@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import zlib
+from typing import TYPE_CHECKING, List, Optional
+
+# Deferred import (see iotrobust/cli.py): numpy
+if TYPE_CHECKING:
+    import numpy as np
+
+# -----------------------
+# Per-task random streams
+# -----------------------
+# Every (model, strategy, run) task owns a stream whose SeedSequence spawn_key is derived
+# from the task identity (crc32 of the model and strategy names, plus the run id) rather than
+# handed out positionally by root.spawn(). Workers build their streams locally without any
+# coordination, and a task draws the same numbers no matter which shard or worker runs it.
+
+DEFAULT_SEED = 42
+
+
+def _name_key(name: Optional[str]) -> int:
+    """Stable 32-bit key for a model/strategy name (unlike hash(), identical across processes)."""
+    return zlib.crc32(name.encode('utf-8')) if name is not None else 0
+
+
+def task_seed_sequence(root_seed: int, model_name: str, strategy: Optional[str], run_id: int) -> np.random.SeedSequence:
+    import numpy as np
+
+    return np.random.SeedSequence(root_seed, spawn_key=(_name_key(model_name), _name_key(strategy), run_id))
+
+
+def task_rng(root_seed: int, model_name: str, strategy: Optional[str], run_id: int) -> np.random.Generator:
+    """Generator for one task; strategy is None for simulations without attack strategies."""
+    import numpy as np
+
+    return np.random.default_rng(task_seed_sequence(root_seed, model_name, strategy, run_id))
+
+
+def fork(rng: np.random.Generator, n: int) -> List[np.random.Generator]:
+    """
+    Independent child streams (e.g. one for graph generation, one for the simulation), so
+    changing how many numbers one stage draws does not shift the other.
+    """
+    return rng.spawn(n)
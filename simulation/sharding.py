@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import glob
+import os
+import socket
+import sqlite3
+import time
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# A task is one (model, strategy, run) experiment. Dynamic simulations have no attack
+# strategy and use None.
+Task = Tuple[str, Optional[str], int]
+
+# -----------------------
+# Static partitioning
+# -----------------------
+
+def enumerate_tasks(models: Iterable[str], strategies: Sequence[Optional[str]], num_runs: int) -> List[Task]:
+    """Lists the full task space in the same order the serial runners execute it."""
+    return [
+        (model_name, strategy, run_id)
+        for model_name in models
+        for strategy in strategies
+        for run_id in range(num_runs)
+    ]
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """Parses an 'i/N' shard spec (0-based index i out of N shards)."""
+    try:
+        index_str, count_str = spec.split('/')
+        index, count = int(index_str), int(count_str)
+    except ValueError:
+        raise ValueError(f"Invalid shard spec '{spec}', expected 'i/N'")
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Invalid shard spec '{spec}', need 0 <= i < N")
+    return index, count
+
+
+def select_shard(tasks: List[Task], index: int, count: int) -> List[Task]:
+    """
+    Deterministic round-robin partition of the task list. Interleaving (rather than
+    contiguous blocks) spreads expensive models evenly over the shards.
+    """
+    return tasks[index::count]
+
+
+def shard_path(path: str, index: int, count: int) -> str:
+    stem, ext = os.path.splitext(path)
+    return f"{stem}.shard-{index}-of-{count}{ext}"
+
+
+def worker_path(path: str, worker_id: str) -> str:
+    stem, ext = os.path.splitext(path)
+    return f"{stem}.worker-{worker_id}{ext}"
+
+
+def partial_outputs(path: str) -> List[str]:
+    """Finds every shard and worker output written for the given result path."""
+    stem, ext = os.path.splitext(path)
+    found = glob.glob(f"{glob.escape(stem)}.shard-*{ext}") + glob.glob(f"{glob.escape(stem)}.worker-*{ext}")
+    return sorted(found)
+
+# -----------------------
+# Merging
+# -----------------------
+
+def merge_results(
+        inputs: List[str],
+        task_columns: List[str],
+        order: Dict[str, List[str]],
+) -> pd.DataFrame:
+    """
+    Concatenates partial result files into one result set ordered like a serial run.
+    Tasks that appear in more than one input (e.g. re-run after a worker crash) are kept once.
+    `order` maps categorical task columns to their configured order (models, strategies).
+    """
+    import pandas as pd
+
+    if not inputs:
+        raise FileNotFoundError("No partial result files to merge")
+
+    frames = []
+    seen = set()
+    for path in inputs:
+        df = pd.read_csv(path, float_precision='round_trip')  # merged output must equal a serial run bit for bit
+        if df.empty:
+            continue
+        keys = df[task_columns].drop_duplicates()
+        fresh = [k for k in keys.itertuples(index=False, name=None) if k not in seen]
+        seen.update(fresh)
+        if len(fresh) < len(keys):
+            fresh_df = pd.DataFrame(fresh, columns=task_columns)
+            df = df.merge(fresh_df, on=task_columns, how='inner')
+        frames.append(df)
+
+    if not frames:
+        return pd.DataFrame()
+
+    merged = pd.concat(frames, ignore_index=True)
+    sort_keys = []
+    for col in task_columns:
+        if col in order:
+            key = f"__{col}_order"
+            merged[key] = merged[col].map({v: i for i, v in enumerate(order[col])})
+            sort_keys.append(key)
+        else:
+            sort_keys.append(col)
+    # Stable sort keeps the per-step row order inside each task
+    merged = merged.sort_values(sort_keys, kind='stable').drop(columns=[k for k in sort_keys if k.startswith('__')])
+    return merged.reset_index(drop=True)
+
+def missing_tasks(merged: pd.DataFrame, expected: Iterable[tuple], task_columns: List[str]) -> List[tuple]:
+    """
+    Task keys (values of task_columns) of the full sweep that have no rows in merged, e.g. the
+    tasks of a shard that was never run or of a queue worker that crashed mid-task.
+    """
+    present = set()
+    if not merged.empty:
+        present = set(merged[task_columns].drop_duplicates().itertuples(index=False, name=None))
+    return [key for key in expected if key not in present]
+
+
+def report_missing(missing: List[tuple], path: str, limit: int = 5):
+    if not missing:
+        return
+    shown = ", ".join(str(key) for key in missing[:limit]) + (", ..." if len(missing) > limit else "")
+    print(f"Warning: '{path}' is missing {len(missing)} tasks: {shown}")
+
+# -----------------------
+# Dynamic work queue
+# -----------------------
+
+class WorkQueue:
+    """
+    SQLite-backed task queue shared by worker processes on one machine or a shared filesystem.
+    Workers claim tasks one at a time inside an IMMEDIATE transaction, so each pending task is
+    handed out exactly once. Populating is idempotent, so every worker may call it on startup.
+    """
+
+    def __init__(self, path: str, lease_seconds: Optional[float] = None):
+        self.path = path
+        self.lease_seconds = lease_seconds  # reclaim tasks claimed longer ago than this (crashed workers)
+        self.conn = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            " id INTEGER PRIMARY KEY,"
+            " model_name TEXT NOT NULL,"
+            " strategy TEXT NOT NULL,"
+            " run_id INTEGER NOT NULL,"
+            " status TEXT NOT NULL DEFAULT 'pending',"
+            " worker TEXT,"
+            " claimed_at REAL,"
+            " UNIQUE (model_name, strategy, run_id))"
+        )
+
+    def close(self):
+        self.conn.close()
+
+    def populate(self, tasks: List[Task]):
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO tasks (id, model_name, strategy, run_id) VALUES (?, ?, ?, ?)",
+                [(i, m, s or '', r) for i, (m, s, r) in enumerate(tasks)],
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def claim(self, worker_id: str) -> Optional[Task]:
+        """Atomically takes the next pending task, or returns None when the queue is drained."""
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            query = "SELECT id, model_name, strategy, run_id FROM tasks WHERE status = 'pending'"
+            args: tuple = ()
+            if self.lease_seconds is not None:
+                query += " OR (status = 'claimed' AND claimed_at < ?)"
+                args = (now - self.lease_seconds,)
+            row = self.conn.execute(query + " ORDER BY id LIMIT 1", args).fetchone()
+            if row is None:
+                self.conn.execute("COMMIT")
+                return None
+            task_id, model_name, strategy, run_id = row
+            self.conn.execute(
+                "UPDATE tasks SET status = 'claimed', worker = ?, claimed_at = ? WHERE id = ?",
+                (worker_id, now, task_id),
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return model_name, strategy or None, run_id
+
+    def complete(self, task: Task):
+        model_name, strategy, run_id = task
+        self.conn.execute(
+            "UPDATE tasks SET status = 'done' WHERE model_name = ? AND strategy = ? AND run_id = ?",
+            (model_name, strategy or '', run_id),
+        )
+
+    def counts(self) -> Dict[str, int]:
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall())
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def append_csv(df: pd.DataFrame, path: str):
+    """Appends rows to a CSV, writing the header only when the file is new."""
+    df.to_csv(path, mode='a', index=False, header=not os.path.exists(path))
@@ -1,76 +1,270 @@
-import pandas as pd
-from tqdm import tqdm
-from typing import Dict, Any
+from __future__ import annotations
 
-from config import STATIC_SIMULATION_CONFIG
-from models.model_generator import generate_network
-from analysis.static_graph_models_analysis import simulate_attack
+import argparse
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple
+
+# Deferred imports (see iotrobust/cli.py): pandas, tqdm, networkx, analysis.*
+from simulation.convergence import ConvergenceTracker, criteria_from_config, format_runs_report
+from simulation.seeding import DEFAULT_SEED, fork, task_rng
+from simulation.sharding import (
+    Task,
+    WorkQueue,
+    append_csv,
+    default_worker_id,
+    enumerate_tasks,
+    merge_results,
+    missing_tasks,
+    parse_shard,
+    partial_outputs,
+    report_missing,
+    select_shard,
+    shard_path,
+    worker_path,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+TASK_COLUMNS = ['model_name', 'attack_strategy', 'run_id']
 
 class SimulationRunner:
     """Encapsulates the logic for running the simulation suite."""
 
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], r_index_only: bool = False):
         self.config = config
+        self.r_index_only = r_index_only  # skip the per-step metrics, keep only the percolation summary
         self.results = []
+        self.summaries = []
+        self.runs_used: Dict[Tuple[str, str], int] = {}
+        self.ci_widths: Dict[Tuple[str, str], Dict[str, float]] = {}
 
     def run(self) -> pd.DataFrame:
         """Executes the simulation based on the provided configuration."""
-        num_total_runs = (
-                len(self.config['models']) * len(self.config['strategies']) * self.config['num_runs_per_setting']
-        )
-        print(f"Starting simulations... Total experiments to run: {num_total_runs}")
+        import pandas as pd
+        from tqdm import tqdm
+
+        criteria = criteria_from_config(self.config.get('convergence'))
+        runs_per_setting = criteria.max_runs if criteria else self.config['num_runs_per_setting']
+        num_total_runs = len(self.config['models']) * len(self.config['strategies']) * runs_per_setting
+        if criteria:
+            print(f"Starting adaptive simulations... At most {num_total_runs} experiments will run.")
+        else:
+            print(f"Starting simulations... Total experiments to run: {num_total_runs}")
 
         with tqdm(total=num_total_runs, desc="Overall Progress") as pbar:
             for model_name, model_params in self.config['models'].items():
                 for strategy in self.config['strategies']:
-                    for i in range(self.config['num_runs_per_setting']):
-
-                        # --- 1. Generate network (corrected call) ---
-                        params_for_func = model_params.copy()
-                        params_for_func.pop('model_type')
-                        G = generate_network(
-                            model_type=model_params['model_type'],
-                            num_nodes=self.config['num_nodes'],
-                            **params_for_func
-                        )
-
-                        # --- 2. Run attack simulation to get the dictionary of results ---
-                        attack_results = simulate_attack(G, strategy)
-
-                        # --- 3. Process the dictionary of results ---
-                        # The number of steps is the length of any of the metric lists
-                        num_steps = len(attack_results['lcc'])
-                        num_graph_nodes = len(G.nodes()) # Use actual graph size for accuracy
-
-                        for step in range(num_steps):
-                            # Start with the base info for this row
-                            row_data = {
-                                'model_name': model_name,
-                                'attack_strategy': strategy,
-                                'run_id': i,
-                                'nodes_removed_fraction': step / num_graph_nodes if num_graph_nodes > 0 else 0
-                            }
-
-                            # Add the value of each metric at the current step to the row
-                            for metric_name, values_list in attack_results.items():
-                                # This will create columns like 'lcc' and 'smoothness'
-                                row_data[metric_name] = values_list[step]
-
-                            self.results.append(row_data)
-
+                    tracker = ConvergenceTracker(criteria) if criteria else None
+                    i = 0
+                    while (tracker.should_continue() if tracker else i < runs_per_setting):
+                        attack_results = self._run_single(model_name, model_params, strategy, i)
+                        if tracker:
+                            # One scalar per run: the mean of each metric over the attack curve
+                            tracker.add({m: float(sum(v)) / len(v) for m, v in attack_results.items()})
+                        i += 1
                         pbar.update(1)
 
+                    self.runs_used[(model_name, strategy)] = i
+                    if tracker:
+                        self.ci_widths[(model_name, strategy)] = tracker.widths()
+                        # Skipped runs still count towards the progress bar total
+                        pbar.update(runs_per_setting - i)
+
+        print("Simulations complete.")
+        if criteria:
+            print(format_runs_report(self.runs_used, self.ci_widths))
+        return pd.DataFrame(self.results)
+
+    def summary(self) -> pd.DataFrame:
+        """Per-run robustness summary (R-index, critical fraction, AC AUC) of the runs executed so far."""
+        import pandas as pd
+
+        return pd.DataFrame(self.summaries)
+
+    def all_tasks(self) -> List[Task]:
+        return enumerate_tasks(self.config['models'], self.config['strategies'], self.config['num_runs_per_setting'])
+
+    def run_tasks(self, tasks: List[Task]) -> pd.DataFrame:
+        """Executes an explicit list of (model, strategy, run) tasks, e.g. one shard of the sweep."""
+        import pandas as pd
+        from tqdm import tqdm
+
+        print(f"Starting simulations... Experiments in this shard: {len(tasks)}")
+        for model_name, strategy, i in tqdm(tasks, desc="Shard Progress"):
+            self._run_single(model_name, self.config['models'][model_name], strategy, i)
         print("Simulations complete.")
         return pd.DataFrame(self.results)
 
-def main():
+    def run_queue(self, queue: WorkQueue, worker_id: str, output_path: str, summary_path: str) -> int:
+        """
+        Pulls tasks from a shared queue until it is drained. Rows are appended to the worker's
+        outputs after every task, before the task is marked done.
+        """
+        import pandas as pd
+        from tqdm import tqdm
+
+        queue.populate(self.all_tasks())
+        completed = 0
+        with tqdm(desc=f"Worker {worker_id}", unit="run") as pbar:
+            while (task := queue.claim(worker_id)) is not None:
+                model_name, strategy, i = task
+                self.results = []
+                self.summaries = []
+                self._run_single(model_name, self.config['models'][model_name], strategy, i)
+                if self.results:
+                    append_csv(pd.DataFrame(self.results), output_path)
+                append_csv(pd.DataFrame(self.summaries), summary_path)
+                queue.complete(task)
+                completed += 1
+                pbar.update(1)
+        return completed
+
+    def _run_single(self, model_name: str, model_params: Dict[str, Any], strategy: str, i: int) -> Dict[str, List[float]]:
+        """Runs one (model, strategy, run) experiment and appends its per-step rows and summary row."""
+        from models.model_generator import generate_network
+        from analysis.static_graph_models_analysis import (
+            attack_order,
+            percolation_lcc_curve,
+            robustness_summary,
+            simulate_attack,
+        )
+
+        # Each task has its own stream, so results do not depend on which shard/worker runs it
+        graph_rng, attack_rng = fork(task_rng(self.config.get('seed', DEFAULT_SEED), model_name, strategy, i), 2)
+
+        # --- 1. Generate network (corrected call) ---
+        params_for_func = model_params.copy()
+        params_for_func.pop('model_type')
+        G = generate_network(
+            model_type=model_params['model_type'],
+            num_nodes=self.config['num_nodes'],
+            seed=graph_rng,
+            **params_for_func
+        )
+
+        task = {'model_name': model_name, 'attack_strategy': strategy, 'run_id': i}
+        threshold = self.config.get('critical_lcc_threshold', 0.5)
+
+        if self.r_index_only:
+            # Fast path: LCC curve from union-find percolation, no per-step rows
+            attack_results = {'lcc': percolation_lcc_curve(G, attack_order(G, strategy, attack_rng))}
+            self.summaries.append({**task, **robustness_summary(attack_results, threshold)})
+            return attack_results
+
+        # --- 2. Run attack simulation to get the dictionary of results ---
+        attack_results = simulate_attack(G, strategy, attack_rng)
+        self.summaries.append({**task, **robustness_summary(attack_results, threshold)})
+
+        # --- 3. Process the dictionary of results ---
+        # The number of steps is the length of any of the metric lists
+        num_steps = len(attack_results['lcc'])
+        num_graph_nodes = len(G.nodes()) # Use actual graph size for accuracy
+
+        for step in range(num_steps):
+            # Start with the base info for this row
+            row_data = {
+                'model_name': model_name,
+                'attack_strategy': strategy,
+                'run_id': i,
+                'nodes_removed_fraction': step / num_graph_nodes if num_graph_nodes > 0 else 0
+            }
+
+            # Add the value of each metric at the current step to the row
+            for metric_name, values_list in attack_results.items():
+                # This will create columns like 'lcc' and 'smoothness'
+                row_data[metric_name] = values_list[step]
+
+            self.results.append(row_data)
+
+        return attack_results
+
+def merge_outputs(
+        config: Dict[str, Any],
+        output_file: str,
+        inputs: Optional[List[str]] = None,
+        summary_file: Optional[str] = None,
+) -> Optional[pd.DataFrame]:
+    """
+    Combines shard/worker outputs into single result (and summary) files ordered like a serial
+    run. Per-step results are absent for --r-index-only sweeps; only the summary is merged then.
+    """
+    order = {'model_name': list(config['models']), 'attack_strategy': list(config['strategies'])}
+    expected = enumerate_tasks(config['models'], config['strategies'], config['num_runs_per_setting'])
+    merged = None
+    inputs = inputs or partial_outputs(output_file)
+    summary_inputs = partial_outputs(summary_file) if summary_file else []
+    if not inputs and not summary_inputs:
+        raise FileNotFoundError(f"No shard/worker outputs found for '{output_file}'")
+    if inputs:
+        merged = merge_results(inputs, task_columns=TASK_COLUMNS, order=order)
+        merged.to_csv(output_file, index=False)
+        print(f"Merged {len(inputs)} partial result files into '{output_file}'")
+        report_missing(missing_tasks(merged, expected, TASK_COLUMNS), output_file)
+    if summary_inputs:
+        merged_summary = merge_results(summary_inputs, task_columns=TASK_COLUMNS, order=order)
+        merged_summary.to_csv(summary_file, index=False)
+        print(f"Merged {len(summary_inputs)} partial summary files into '{summary_file}'")
+        report_missing(missing_tasks(merged_summary, expected, TASK_COLUMNS), summary_file)
+    return merged
+
+def main(argv: Optional[List[str]] = None):
     """Main function to execute the simulation and save the results."""
-    runner = SimulationRunner(config=STATIC_SIMULATION_CONFIG)
-    results_dataframe = runner.run()
+    parser = argparse.ArgumentParser(description="Run static attack simulations and export results.")
+    parser.add_argument('--output', type=str, default=None, help='Override the results filename.')
+    parser.add_argument('--summary', type=str, default=None, help='Override the per-run robustness summary filename.')
+    parser.add_argument('--r-index-only', action='store_true',
+                        help='Only compute the LCC-based summary (R-index, critical fraction) via union-find; '
+                             'no per-step results are written.')
+    parser.add_argument('--shard', type=str, default=None, help="Run only shard i of N of the task space ('i/N', 0-based).")
+    parser.add_argument('--queue', type=str, default=None, help='Pull tasks from a shared SQLite work queue at this path.')
+    parser.add_argument('--worker-id', type=str, default=None, help='Worker name used for the queue output file.')
+    parser.add_argument('--lease', type=float, default=None, metavar='SECONDS',
+                        help='Re-run queue tasks claimed more than SECONDS ago (left behind by crashed workers).')
+    parser.add_argument('--merge', nargs='*', default=None, metavar='FILE',
+                        help='Merge partial outputs (default: all shard/worker files of the results filename).')
+    args = parser.parse_args(argv)
+
+    from config import STATIC_SIMULATION_CONFIG
+    config = STATIC_SIMULATION_CONFIG
+    output_file = args.output or config['results_filename']
+    summary_file = args.summary or config.get('summary_filename', 'static_summary.csv')
+
+    if args.merge is not None:
+        try:
+            merge_outputs(config, output_file, args.merge, summary_file)
+        except FileNotFoundError as e:
+            parser.error(str(e))
+        return
+
+    if (args.shard or args.queue) and criteria_from_config(config.get('convergence')):
+        parser.error("--shard/--queue need a fixed run count; disable 'convergence' in config.py")
+
+    runner = SimulationRunner(config=config, r_index_only=args.r_index_only)
+
+    if args.queue:
+        worker_id = args.worker_id or default_worker_id()
+        queue = WorkQueue(args.queue, lease_seconds=args.lease)
+        try:
+            completed = runner.run_queue(queue, worker_id, worker_path(output_file, worker_id),
+                                         worker_path(summary_file, worker_id))
+        finally:
+            queue.close()
+        print(f"\nWorker '{worker_id}' completed {completed} tasks")
+        return
+
+    if args.shard:
+        index, count = parse_shard(args.shard)
+        results_dataframe = runner.run_tasks(select_shard(runner.all_tasks(), index, count))
+        output_file = shard_path(output_file, index, count)
+        summary_file = shard_path(summary_file, index, count)
+    else:
+        results_dataframe = runner.run()
 
-    output_file = STATIC_SIMULATION_CONFIG['results_filename']
-    results_dataframe.to_csv(output_file, index=False)
-    print(f"\nResults successfully saved to '{output_file}'")
+    if not args.r_index_only:
+        results_dataframe.to_csv(output_file, index=False)
+        print(f"\nResults successfully saved to '{output_file}'")
+    runner.summary().to_csv(summary_file, index=False)
+    print(f"Robustness summary saved to '{summary_file}'")
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,82 @@
+from collections import Counter
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from analysis.cascades import CascadeModel
+from analysis.dynamic_graph_models_analysis import build_operational_graph
+
+
+def check_invariants(model: CascadeModel, graph: nx.Graph, shortest: bool = False):
+    """Compares the incremental bookkeeping with a recount from the stored paths and a fresh BFS."""
+    op = build_operational_graph(graph)
+    recount: Counter = Counter()
+    for f, ((s, t), path) in enumerate(zip(model.flows, model.paths)):
+        reachable = s in op and t in op and nx.has_path(op, s, t)
+        assert (path is not None) == reachable
+        assert (f in model.dropped) == (path is None)
+        if path is None:
+            continue
+        assert (path[0], path[-1]) == (s, t)
+        assert all(op.has_edge(a, b) for a, b in zip(path, path[1:]))
+        if shortest:
+            assert len(path) - 1 == nx.shortest_path_length(op, s, t)
+        for n in path[1:-1]:
+            recount[n] += 1
+            assert f in model.flows_at[n]
+
+    assert {n: c for n, c in model.load.items() if c} == dict(recount)
+    assert all(sum(1 for f in fs if model.paths[f] is not None) == recount[n] for n, fs in model.flows_at.items())
+    assert all(model.load[n] <= model.capacity[n] for n in op)
+
+
+def fail_node(graph: nx.Graph, n: int):
+    graph.nodes[n]['online'] = False
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_incremental_loads_match_recount(seed):
+    rng = np.random.default_rng(seed)
+    graph = nx.gnm_random_graph(60, 150, seed=seed)
+    model = CascadeModel(graph, 80, 0.3, 5, rng)
+    check_invariants(model, graph, shortest=True)
+
+    # Losses only: every routed flow also stays on a shortest path
+    cascade_failures = 0
+    for _ in range(8):
+        nodes = [int(n) for n in rng.choice(60, size=2, replace=False) if graph.nodes[int(n)].get('online', True)]
+        edges = list(graph.edges())
+        links = [edges[i] for i in rng.choice(len(edges), size=3, replace=False)]
+        for n in nodes:
+            fail_node(graph, n)
+        for u, v in links:
+            graph.edges[u, v]['up'] = False
+        cascade_failures += sum(len(wave) for wave in model.propagate(nodes, links))
+        check_invariants(model, graph, shortest=True)
+    assert cascade_failures > 0
+
+    # Everything comes back: dropped flows are rerouted
+    for n in graph.nodes():
+        graph.nodes[n]['online'] = True
+    for u, v in graph.edges():
+        graph.edges[u, v]['up'] = True
+    model.propagate([], [], restored=True)
+    check_invariants(model, graph)
+
+
+@pytest.mark.parametrize('graph', [nx.complete_graph(6), nx.cycle_graph(7)], ids=['complete', 'cycle'])
+def test_link_loss_reroutes_every_flow_over_it(graph):
+    # Covers single-hop flows (no relay on the link) and links between an endpoint and a relay
+    base = CascadeModel(graph.copy(), 30, 10.0, 5, np.random.default_rng(0))
+    first_links = {(p[0], p[1]) for p in base.paths if p is not None and len(p) > 1}
+    assert any(len(p) == 2 for p in base.paths if p is not None)
+    for u, v in first_links:
+        g = graph.copy()
+        model = CascadeModel(g, 30, 10.0, 5, np.random.default_rng(0))
+        g.edges[u, v]['up'] = False
+        model.propagate([], [(u, v)])
+        for path in model.paths:
+            if path is not None:
+                assert {(u, v), (v, u)}.isdisjoint(zip(path, path[1:]))
+        check_invariants(model, g)
@@ -0,0 +1,32 @@
+import math
+
+import pytest
+
+from simulation.convergence import ConvergenceCriteria, ConvergenceTracker, ci_width
+
+
+def test_single_sample_has_no_interval():
+    assert ci_width([0.7], 0.95) == math.inf
+    assert ci_width([], 0.95) == math.inf
+
+
+def test_identical_samples_have_zero_width():
+    assert ci_width([0.5, 0.5, 0.5], 0.95) == 0.0
+
+
+def test_width_matches_student_t():
+    # mean 2, sample std 1, n = 3: t_{0.975, 2} = 4.302653
+    assert ci_width([1.0, 2.0, 3.0], 0.95) == pytest.approx(2 * 4.302653 / math.sqrt(3), rel=1e-6)
+
+
+@pytest.mark.parametrize('values', [[math.inf, math.inf], [math.inf, 10.0, 12.0], [math.nan, math.nan]])
+def test_non_finite_samples_never_converge(values):
+    assert ci_width(values, 0.95) == math.inf
+
+
+def test_min_runs_one_waits_for_a_variance_estimate():
+    tracker = ConvergenceTracker(ConvergenceCriteria(metrics=['lcc'], target_ci_width=0.01, min_runs=1, max_runs=5))
+    tracker.add({'lcc': 0.37})
+    assert not tracker.converged()
+    tracker.add({'lcc': 0.37})
+    assert tracker.converged()
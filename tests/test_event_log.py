@@ -0,0 +1,123 @@
+import copy
+from typing import Optional
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from analysis.dynamic_graph_models_analysis import DynamicParams, simulate_dynamic
+from analysis.event_log import (
+    LINK_ADDED,
+    LINK_DOWN,
+    LINK_REMOVED,
+    LINK_UP,
+    NODE_DEATH,
+    NODE_FAIL,
+    NODE_RECOVER,
+    EventLog,
+    EventLogWriter,
+    NetworkState,
+)
+from analysis.spatial_links import SpatialLinkParams, edge_key
+from models.model_generator import generate_network
+
+
+def random_log(path: str, steps: int, snapshot_interval: int, seed: int):
+    """Writes random events over a small ring and returns the state after every step, applied from scratch."""
+    rng = np.random.default_rng(seed)
+    G = nx.cycle_graph(12)
+    kinds = [NODE_FAIL, NODE_RECOVER, NODE_DEATH, LINK_DOWN, LINK_UP, LINK_ADDED, LINK_REMOVED]
+    states, state = [], NetworkState()
+    with EventLogWriter(path, G, snapshot_interval=snapshot_interval, buffer_bytes=64) as log:
+        for step in range(steps):
+            log.begin_step(step)
+            for _ in range(rng.integers(0, 4)):  # some steps have no events
+                kind = kinds[rng.integers(len(kinds))]
+                a, b = (int(x) for x in rng.choice(12, size=2, replace=False))
+                log.record(kind, a, b)
+                state.apply(kind, a, b)
+            states.append(state.copy())
+    return states
+
+
+@pytest.mark.parametrize('snapshot_interval', [1, 7, 1000])
+def test_seek_and_replay_match_sequential_application(tmp_path, snapshot_interval):
+    path = str(tmp_path / 'random.evlog')
+    states = random_log(path, 150, snapshot_interval, seed=snapshot_interval)
+    log = EventLog(path)
+    assert log.last_step == 149
+    for step in range(150):
+        assert log.state_at(step) == states[step]
+    for start, stop, every in [(0, 149, 1), (13, 101, 9), (140, 149, 4)]:
+        replayed = [(step, st.copy()) for step, st in log.replay(start, stop, every)]
+        assert replayed == [(step, states[step]) for step in range(start, stop + 1, every)]
+
+
+def test_empty_log(tmp_path):
+    path = str(tmp_path / 'empty.evlog')
+    with EventLogWriter(path, nx.path_graph(3)) as log:
+        log.begin_step(0)
+    log = EventLog(path)
+    assert len(log.events) == 0 and log.state_at(0) == NetworkState()
+    assert sorted(log.graph().edges()) == [(0, 1), (1, 2)]
+
+
+def mobile_params(steps: int) -> DynamicParams:
+    return DynamicParams(
+        steps=steps,
+        node_failure_period=10,
+        node_recovery_steps=5,
+        link_flip_prob=0.02,
+        link_down_steps=3,
+        link_model='spatial',
+        spatial=SpatialLinkParams(mobility_fraction=0.1, mobility_step=0.02),
+    )
+
+
+def run(steps: int, log_path: Optional[str] = None, snapshot_interval: int = 16):
+    G = generate_network('RGG', 150, seed=7, radius=0.15)
+    initial = copy.deepcopy(G)
+    rng = np.random.default_rng(3)
+    if log_path is None:
+        simulate_dynamic(G, params=mobile_params(steps), rng=rng)
+    else:
+        with EventLogWriter(log_path, G, snapshot_interval=snapshot_interval) as log:
+            simulate_dynamic(G, params=mobile_params(steps), event_log=log, rng=rng)
+    return initial, G
+
+
+def rebuild(log: EventLog, state: NetworkState):
+    """Topology, offline nodes and down links the log describes for a state."""
+    edges = {edge_key(u, v) for u, v in log.edges.tolist()}
+    edges = (edges - state.removed_edges) | state.added_edges
+    return edges, state.offline, state.down_edges
+
+
+def observed(G):
+    edges = {edge_key(u, v) for u, v in G.edges()}
+    offline = {n for n, d in G.nodes(data=True) if not d.get('online', True)}
+    down = {edge_key(u, v) for u, v, d in G.edges(data=True) if not d.get('up', True)}
+    return edges, offline, down
+
+
+@pytest.fixture(scope='module')
+def mobile_log(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('evlog') / 'run.evlog')
+    initial, final = run(120, path)
+    return EventLog(path), initial, final
+
+
+def test_index_stores_initial_topology_and_positions(mobile_log):
+    log, initial, final = mobile_log
+    assert {edge_key(u, v) for u, v in log.edges.tolist()} == {edge_key(u, v) for u, v in initial.edges()}
+    assert {edge_key(u, v) for u, v in final.edges()} != {edge_key(u, v) for u, v in initial.edges()}
+    expected_pos = np.array([initial.nodes[n]['pos'] for n in log.nodes.tolist()])
+    np.testing.assert_allclose(log.pos, expected_pos)
+
+
+@pytest.mark.parametrize('steps', [1, 41, 80, 120])
+def test_replay_matches_simulation_with_mobility(mobile_log, steps):
+    # simulate_dynamic draws step by step, so a shorter run reproduces a prefix of the logged one
+    log, _, _ = mobile_log
+    _, graph_at_step = run(steps)
+    assert rebuild(log, log.state_at(steps - 1)) == observed(graph_at_step)
@@ -0,0 +1,27 @@
+import pytest
+
+from config import STATIC_SIMULATION_CONFIG
+from models.model_generator import generate_network
+from models.model_visualizations.large_scale import scaled_model_params
+
+BASE_NODES = STATIC_SIMULATION_CONFIG['num_nodes']
+
+
+@pytest.mark.parametrize('model_name', list(STATIC_SIMULATION_CONFIG['models']))
+def test_configured_node_count_keeps_configured_params(model_name):
+    model_params = STATIC_SIMULATION_CONFIG['models'][model_name]
+    assert scaled_model_params(model_params, BASE_NODES, BASE_NODES) == model_params
+
+
+def test_hierarchical_default_size_matches_config():
+    params = dict(STATIC_SIMULATION_CONFIG['models']['Hierarchical'])
+    expected = generate_network(num_nodes=BASE_NODES, **params).number_of_nodes()
+    G = generate_network(num_nodes=BASE_NODES, **scaled_model_params(params, BASE_NODES, BASE_NODES))
+    assert G.number_of_nodes() == expected == 1 + params['num_gateways'] * (1 + params['sensors_per_gateway'])
+
+
+def test_override_rescales_hierarchical_and_rgg():
+    hier = scaled_model_params({'model_type': 'HIER', 'num_gateways': 10, 'sensors_per_gateway': 9}, 2011, BASE_NODES)
+    assert hier['sensors_per_gateway'] == 200
+    rgg = scaled_model_params({'model_type': 'RGG', 'radius': 0.1}, 4 * BASE_NODES, BASE_NODES)
+    assert rgg['radius'] == pytest.approx(0.05)
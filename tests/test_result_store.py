@@ -0,0 +1,72 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from plots.result_store import KEY_COLUMNS, ResultStore, summarize_frame
+
+
+def write_results(path: str, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    rows = [
+        {'model_name': m, 'attack_strategy': s, 'run_id': r, 'nodes_removed_fraction': f,
+         'lcc': rng.random(), 'smoothness': rng.random()}
+        for m in ['ER', 'BA', 'RGG']
+        for s in ['random', 'targeted_degree']
+        for r in range(3)
+        for f in np.linspace(0.0, 1.0, 11)
+    ]
+    df = pd.DataFrame(rows)
+    df.to_csv(path, index=False)
+    return pd.read_csv(path)
+
+
+@pytest.fixture
+def store(tmp_path):
+    with ResultStore(str(tmp_path / 'results.sqlite')) as s:
+        yield s
+
+
+@pytest.mark.parametrize('models, strategies, fraction_range', [
+    (None, None, None),
+    (['ER', 'RGG'], None, None),
+    (None, ['targeted_degree'], (0.2, 0.7)),
+    (['BA'], ['random'], (None, 0.3)),
+])
+def test_summary_matches_pandas(tmp_path, store, models, strategies, fraction_range):
+    df = write_results(str(tmp_path / 'results.csv'))
+    assert store.ingest(str(tmp_path / 'results.csv'))
+    for metric in ['lcc', 'smoothness']:
+        cached = store.summary(metric, models, strategies, fraction_range)
+        expected = summarize_frame(df, metric, models, strategies, fraction_range)
+        expected = expected.sort_values(['model_name', 'attack_strategy', 'nodes_removed_fraction'], ignore_index=True)
+        pd.testing.assert_frame_equal(cached, expected, check_exact=False, rtol=1e-12)
+
+
+def test_ingest_once_per_file_version(tmp_path, store):
+    path = str(tmp_path / 'results.csv')
+    write_results(path)
+    assert store.ingest(path)
+    assert not store.ingest(path)
+    before = store.summary('lcc')
+
+    df = write_results(path, seed=1)
+    os.utime(path, ns=(1, 1))  # the fingerprint must change even within the mtime resolution
+    assert store.ingest(path)
+    after = store.summary('lcc')
+    assert not after['lcc'].equals(before['lcc'])
+    assert after['lcc'].tolist() == pytest.approx(summarize_frame(df, 'lcc')['lcc'].tolist())
+
+
+def test_metric_names_are_checked_before_use_in_sql(tmp_path, store):
+    path = str(tmp_path / 'results.csv')
+    write_results(path)
+    store.ingest(path)
+    assert store.metrics() == ['lcc', 'smoothness']
+    for bad in KEY_COLUMNS + ['missing', 'lcc") FROM results; DROP TABLE results; --']:
+        with pytest.raises(ValueError):
+            store.summary(bad)
+        with pytest.raises(ValueError):
+            store.rows([bad])
+    assert len(store.rows(['lcc'])) == 3 * 2 * 3 * 11
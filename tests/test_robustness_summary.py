@@ -0,0 +1,46 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from analysis.static_graph_models_analysis import (
+    attack_order,
+    critical_fraction,
+    percolation_lcc_curve,
+    r_index,
+    robustness_summary,
+    simulate_attack,
+)
+from models.model_generator import generate_network
+
+STRATEGIES = ['random', 'targeted_degree', 'targeted_centrality']
+
+
+@pytest.mark.parametrize('strategy', STRATEGIES)
+@pytest.mark.parametrize('model_type, params', [
+    ('ER', {'p': 0.06}),
+    ('BA', {'m': 2}),
+    ('WS', {'k': 4, 'p': 0.1}),
+    ('RGG', {'radius': 0.2}),
+    ('HIER', {'num_gateways': 4, 'sensors_per_gateway': 6}),
+])
+def test_union_find_curve_matches_simulated_attack(model_type, params, strategy):
+    G = generate_network(model_type, 60, seed=11, **params)
+    # Both draw the random attack order first from identically seeded streams
+    expected = simulate_attack(G, strategy, np.random.default_rng(5))['lcc']
+    order = attack_order(G, strategy, np.random.default_rng(5))
+    assert percolation_lcc_curve(G, order) == expected
+
+
+def test_summary_of_a_hand_computed_path_graph():
+    # Removing 1, 2, 0, 3 from the path 0-1-2-3 leaves LCCs of 2, 1, 1 and 0 nodes
+    lcc = percolation_lcc_curve(nx.path_graph(4), [1, 2, 0, 3])
+    assert lcc == [1.0, 0.5, 0.25, 0.25, 0.0]
+    assert r_index(lcc) == pytest.approx(0.25)
+    assert critical_fraction(lcc, 0.5) == pytest.approx(0.5)
+    assert critical_fraction(lcc, 0.6) == pytest.approx(0.25)
+    assert critical_fraction([1.0, 1.0], 0.5) == 1.0
+
+    summary = robustness_summary({'lcc': lcc, 'algebraic_connectivity': [2.0, 1.0, 0.0, 0.0, 0.0]})
+    # trapezoid over fractions 0, 0.25, ..., 1: 0.25 * ((2 + 1) / 2 + (1 + 0) / 2)
+    assert summary == pytest.approx({'r_index': 0.25, 'critical_fraction': 0.5, 'ac_auc': 0.5})
+    assert 'ac_auc' not in robustness_summary({'lcc': lcc})
@@ -0,0 +1,65 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from analysis.dynamic_graph_models_analysis import build_operational_graph
+from analysis.routing import INF, SinkTreeRouter
+
+
+def check_tree(router: SinkTreeRouter, graph: nx.Graph):
+    """Compares the repaired forest with a fresh multi-source BFS from the online sinks."""
+    op = build_operational_graph(graph)
+    roots = [s for s in router.sinks if s in op]
+    exact = nx.multi_source_dijkstra_path_length(op, roots) if roots else {}
+    for n in graph.nodes():
+        assert router.dist[n] == exact.get(n, INF), n
+        p = router.parent[n]
+        if router.dist[n] in (0, INF):
+            assert p is None
+        else:
+            assert op.has_edge(n, p) and router.dist[p] == router.dist[n] - 1
+            assert n in router.children[p]
+        path = router.path(n)
+        assert (path is None) == (n not in exact)
+        if path is not None:
+            assert path[-1] in router.sinks and len(path) - 1 == exact[n]
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_incremental_repair_matches_bfs(seed):
+    rng = np.random.default_rng(seed)
+    graph = nx.gnm_random_graph(80, 160, seed=seed)
+    sinks = [int(s) for s in rng.choice(80, size=3, replace=False)]
+    router = SinkTreeRouter(graph, sinks)
+    check_tree(router, graph)
+
+    for _ in range(300):
+        action = rng.integers(6)
+        if action == 0:
+            n = int(rng.integers(80))
+            graph.nodes[n]['online'] = False
+            router.node_down(n)
+        elif action == 1:
+            offline = [n for n, d in graph.nodes(data=True) if not d.get('online', True)]
+            if offline:
+                n = offline[rng.integers(len(offline))]
+                graph.nodes[n]['online'] = True
+                router.node_up(n)
+        elif action in (2, 3):
+            edges = list(graph.edges())
+            u, v = edges[rng.integers(len(edges))]
+            up = action == 3
+            graph.edges[u, v]['up'] = up
+            router.edge_up(u, v) if up else router.edge_down(u, v)
+        elif action == 4:
+            # Mobility: a link disappears from the topology
+            edges = list(graph.edges())
+            u, v = edges[rng.integers(len(edges))]
+            graph.remove_edge(u, v)
+            router.edge_down(u, v)
+        else:
+            u, v = (int(x) for x in rng.choice(80, size=2, replace=False))
+            if not graph.has_edge(u, v):
+                graph.add_edge(u, v)
+                router.edge_up(u, v)
+        check_tree(router, graph)
@@ -0,0 +1,51 @@
+import pandas as pd
+
+from simulation.seeding import fork, task_rng
+from simulation.sharding import enumerate_tasks, merge_results, select_shard
+from simulation.static_simulation import TASK_COLUMNS, SimulationRunner
+
+CONFIG = {
+    'seed': 42,
+    'num_nodes': 30,
+    'num_runs_per_setting': 3,
+    'models': {'Erdos-Renyi': {'model_type': 'ER'}, 'Barabasi-Albert': {'model_type': 'BA', 'm': 2}},
+    'strategies': ['random', 'targeted_degree'],
+}
+
+
+def test_task_streams_are_stable_and_distinct():
+    draw = lambda *task: task_rng(42, *task).random(4).tolist()
+    assert draw('ER', 'random', 0) == draw('ER', 'random', 0)
+    tasks = [('ER', 'random', 0), ('ER', 'random', 1), ('ER', None, 0), ('BA', 'random', 0)]
+    assert len({tuple(draw(*t)) for t in tasks}) == len(tasks)
+    assert task_rng(7, 'ER', 'random', 0).random() != task_rng(42, 'ER', 'random', 0).random()
+
+    a, b = fork(task_rng(42, 'ER', 'random', 0), 2)
+    assert a.random() != b.random()
+
+
+def test_sharded_runs_merge_to_the_serial_output(tmp_path):
+    serial = SimulationRunner(CONFIG)
+    serial_results = serial.run()
+    serial_path = tmp_path / 'serial.csv'
+    serial_results.to_csv(serial_path, index=False)
+
+    tasks = enumerate_tasks(CONFIG['models'], CONFIG['strategies'], CONFIG['num_runs_per_setting'])
+    result_parts, summary_parts = [], []
+    for index in reversed(range(3)):  # shard order must not matter
+        runner = SimulationRunner(CONFIG)
+        results = runner.run_tasks(select_shard(tasks, index, 3))
+        result_parts.append(str(tmp_path / f'results.shard-{index}.csv'))
+        summary_parts.append(str(tmp_path / f'summary.shard-{index}.csv'))
+        results.to_csv(result_parts[-1], index=False)
+        runner.summary().to_csv(summary_parts[-1], index=False)
+
+    order = {'model_name': list(CONFIG['models']), 'attack_strategy': CONFIG['strategies']}
+    merged = merge_results(result_parts, TASK_COLUMNS, order)
+    merged_path = tmp_path / 'merged.csv'
+    merged.to_csv(merged_path, index=False)
+    assert merged_path.read_bytes() == serial_path.read_bytes()
+    pd.testing.assert_frame_equal(merged, pd.read_csv(serial_path, float_precision='round_trip'))
+
+    merged_summary = merge_results(summary_parts, TASK_COLUMNS, order)
+    pd.testing.assert_frame_equal(merged_summary, serial.summary(), check_exact=True)
@@ -0,0 +1,34 @@
+import pandas as pd
+
+from simulation.sharding import WorkQueue, enumerate_tasks, missing_tasks, select_shard
+
+
+def test_shards_partition_the_task_space():
+    tasks = enumerate_tasks(['ER', 'BA'], ['random', 'degree'], 5)
+    shards = [select_shard(tasks, i, 3) for i in range(3)]
+    assert sorted(t for shard in shards for t in shard) == sorted(tasks)
+
+
+def test_expired_lease_hands_a_crashed_workers_task_out_again(tmp_path):
+    tasks = enumerate_tasks(['ER'], [None], 2)
+    path = str(tmp_path / 'queue.db')
+    crashed = WorkQueue(path)
+    crashed.populate(tasks)
+    assert crashed.claim('w1') == ('ER', None, 0)
+    crashed.close()
+
+    without_lease = WorkQueue(path)
+    assert without_lease.claim('w2') == ('ER', None, 1)
+    assert without_lease.claim('w2') is None
+    without_lease.close()
+
+    with_lease = WorkQueue(path, lease_seconds=0.0)
+    assert with_lease.claim('w3') in tasks
+    with_lease.close()
+
+
+def test_missing_tasks_lists_tasks_without_rows():
+    expected = [('ER', 0), ('ER', 1), ('BA', 0)]
+    merged = pd.DataFrame({'model_name': ['ER', 'ER', 'BA'], 'run_id': [0, 0, 0], 'lcc': [1.0, 0.9, 1.0]})
+    assert missing_tasks(merged, expected, ['model_name', 'run_id']) == [('ER', 1)]
+    assert missing_tasks(pd.DataFrame(), expected, ['model_name', 'run_id']) == expected
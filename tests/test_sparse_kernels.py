@@ -0,0 +1,100 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from analysis.dynamic_graph_models_analysis import build_operational_graph
+from analysis.sparse_kernels import (
+    MaskedCSR,
+    batched_bfs,
+    component_labels,
+    largest_component_size,
+    multi_source_bfs,
+    shortest_paths,
+)
+
+
+def damaged_graph(seed: int):
+    """Random graph with non-contiguous labels, some nodes offline and some links down, plus its CSR."""
+    rng = np.random.default_rng(seed)
+    G = nx.relabel_nodes(nx.gnm_random_graph(120, 200, seed=seed), lambda n: 3 * n + 5)
+    csr = MaskedCSR(G)
+    nodes, edges = list(G.nodes()), list(G.edges())
+    for i in rng.choice(len(nodes), size=15, replace=False):
+        G.nodes[nodes[i]]['online'] = False
+        csr.set_node(nodes[i], False)
+    for i in rng.choice(len(edges), size=30, replace=False):
+        u, v = edges[i]
+        G.edges[u, v]['up'] = False
+        csr.set_edge(v, u, False)
+    # A recovery after the masks were cached must invalidate them
+    csr.entry_alive
+    G.nodes[nodes[0]]['online'] = True
+    csr.set_node(nodes[0], True)
+    return G, csr, rng
+
+
+def assert_bfs_tree(csr: MaskedCSR, op: nx.Graph, dist_row: np.ndarray, parent_row: np.ndarray, exact: dict):
+    for i, n in enumerate(csr.nodes):
+        assert dist_row[i] == exact.get(n, -1)
+        if dist_row[i] > 0:
+            p = csr.nodes[parent_row[i]]
+            assert op.has_edge(n, p) and dist_row[parent_row[i]] == dist_row[i] - 1
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_bfs_matches_networkx(seed):
+    G, csr, rng = damaged_graph(seed)
+    op = build_operational_graph(G)
+    sources = [csr.index[n] for n in rng.choice(csr.nodes, size=10, replace=False)]
+    dist, parent = batched_bfs(csr, sources)
+    for row, s in enumerate(sources):
+        exact = nx.single_source_shortest_path_length(op, csr.nodes[s]) if csr.nodes[s] in op else {}
+        assert_bfs_tree(csr, op, dist[row], parent[row], exact)
+
+    roots = [csr.nodes[s] for s in sources if csr.nodes[s] in op]
+    exact = nx.multi_source_dijkstra_path_length(op, roots) if roots else {}
+    dist, nearest = multi_source_bfs(csr, sources)
+    for i, n in enumerate(csr.nodes):
+        assert dist[i] == exact.get(n, -1)
+        if dist[i] >= 0:
+            assert nx.shortest_path_length(op, csr.nodes[nearest[i]], n) == dist[i]
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_shortest_paths_match_networkx(seed):
+    G, csr, rng = damaged_graph(seed)
+    op = build_operational_graph(G)
+    pairs = [tuple(rng.choice(csr.nodes, size=2, replace=False).tolist()) for _ in range(40)]
+    for (s, t), path in zip(pairs, shortest_paths(csr, pairs)):
+        reachable = s in op and t in op and nx.has_path(op, s, t)
+        assert (path is not None) == reachable
+        if path is not None:
+            assert (path[0], path[-1]) == (s, t) and all(op.has_edge(a, b) for a, b in zip(path, path[1:]))
+            assert len(path) - 1 == nx.shortest_path_length(op, s, t)
+
+
+@pytest.mark.parametrize('method', ['csgraph', 'label_propagation'])
+@pytest.mark.parametrize('seed', range(4))
+def test_components_match_networkx(seed, method):
+    G, csr, _ = damaged_graph(seed)
+    op = build_operational_graph(G)
+    labels = component_labels(csr, method)
+    found = {}
+    for n, label in zip(csr.nodes, labels.tolist()):
+        assert (label == -1) == (n not in op)
+        if label >= 0:
+            found.setdefault(label, set()).add(n)
+    expected = list(nx.connected_components(op))
+    assert sorted(map(sorted, found.values())) == sorted(map(sorted, expected))
+    assert largest_component_size(csr, method) == max(map(len, expected))
+
+
+def test_rebuild_after_topology_change():
+    G, csr, _ = damaged_graph(0)
+    u, v = next(iter(G.edges()))
+    G.remove_edge(u, v)
+    G.add_edge(5, 8)
+    csr.rebuild(G)
+    op = build_operational_graph(G)
+    assert largest_component_size(csr) == max(map(len, nx.connected_components(op)))
+    assert (u, v) not in csr.edge_id and (8, 5) in csr.edge_id
@@ -0,0 +1,62 @@
+import copy
+import math
+
+import numpy as np
+import pytest
+
+from analysis.spatial_links import SpatialGrid, SpatialLinkModel, SpatialLinkParams, edge_key
+from models.model_generator import generate_network
+
+RADIUS = 0.15
+
+
+@pytest.mark.parametrize('radius', [0.05, 0.15, 0.4])
+def test_grid_query_matches_brute_force(radius):
+    rng = np.random.default_rng(0)
+    points = rng.random((300, 2))
+    grid = SpatialGrid(RADIUS)
+    for n, p in enumerate(points):
+        grid.insert(n, tuple(p))
+    for n in rng.choice(300, size=100, replace=False):  # moves keep the cells consistent
+        grid.move(int(n), tuple(rng.random(2)))
+    for q in rng.random((50, 2)):
+        expected = {n for n, p in grid.pos.items() if math.dist(p, q) <= radius}
+        assert set(grid.query(tuple(q), radius)) == expected
+
+
+def check_model(model: SpatialLinkModel):
+    """Compares topology and cached per-link state with a brute-force recomputation."""
+    G = model.graph
+    pos = {n: tuple(G.nodes[n]['pos']) for n in G.nodes()}
+    assert pos == model.grid.pos
+    nodes = list(G.nodes())
+    in_range = {edge_key(u, v) for i, u in enumerate(nodes) for v in nodes[i + 1:]
+                if math.dist(pos[u], pos[v]) <= model.radius}
+    assert {edge_key(u, v) for u, v in G.edges()} == in_range
+    assert sorted(model.edges) == sorted(in_range) and len(model.slot) == len(model.edges)
+
+    fresh = SpatialLinkModel(copy.deepcopy(G), model.base, model.down_steps, model.params, np.random.default_rng(0))
+    for e in model.edges:
+        u, v = e
+        i, j = model.slot[e], fresh.slot[e]
+        mid = ((pos[u][0] + pos[v][0]) / 2.0, (pos[u][1] + pos[v][1]) / 2.0)
+        np.testing.assert_allclose(model.mid[i], mid)
+        assert model.edge_mid_cell[e] == model.grid.cell_of(tuple(model.mid[i]))
+        assert e in model.mid_cell_edges[model.edge_mid_cell[e]]
+        assert model.length[i] == pytest.approx(math.dist(pos[u], pos[v]))
+        interferers = sum(1 for w in nodes if w not in e and math.dist(pos[w], mid) <= model.interference_radius)
+        assert model.interferers[i] == interferers
+        assert model.prob[i] == pytest.approx(fresh.prob[j])
+        assert bool(model.up[i]) == G.edges[u, v].get('up', True)
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_mobility_keeps_links_consistent_with_brute_force(seed):
+    G = generate_network('RGG', 200, seed=seed, radius=RADIUS)
+    params = SpatialLinkParams(radius=RADIUS, mobility_fraction=0.2, mobility_step=0.05)
+    model = SpatialLinkModel(G, 0.05, 3, params, np.random.default_rng(seed))
+    check_model(model)
+    for _ in range(30):
+        model.step()
+        model.move_nodes()
+    check_model(model)